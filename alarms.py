@@ -0,0 +1,205 @@
+"""
+Non-blocking alarm dispatcher
+Detection loops call raise_alarm() and go straight back to sampling. Every
+sink (buzzer, LED, log file, webhook) has its own bounded queue and worker
+thread, so a slow webhook never holds up the buzzer and a full queue drops
+alarms instead of blocking. Per-sink metrics: delivered, dropped and
+failed counts, queue depth and enqueue-to-delivery latency.
+
+  alarms = AlarmDispatcher([BuzzerSink(27), LEDSink(22), LogSink("alarms.log")])
+  alarms.raise_alarm("tilt", "Movement detected")
+  alarms.metrics()
+  alarms.close()
+"""
+
+import json
+import time
+import queue
+import threading
+import urllib.request
+from collections import namedtuple
+from datetime import datetime
+
+import RPi.GPIO as GPIO
+
+from animation import Scheduler, blink
+from tone_patterns import Sequencer
+
+QUEUE_SIZE = 64          # alarms waiting per sink before dropping
+WEBHOOK_TIMEOUT = 2.0    # seconds
+
+Alarm = namedtuple("Alarm", "source message when enqueued_ns")
+
+
+class BuzzerSink:
+    name = "buzzer"
+
+    def __init__(self, pin, pattern="alarm", repeat=3):
+        GPIO.setup(pin, GPIO.OUT)
+        self.sequencer = Sequencer(pin)
+        self.pattern = pattern
+        self.repeat = repeat
+
+    def handle(self, alarm):
+        # Restarts the pattern if it is still sounding from the last alarm
+        self.sequencer.play(self.pattern, self.repeat)
+
+    def close(self):
+        self.sequencer.stop()
+
+
+class LEDSink:
+    name = "led"
+
+    def __init__(self, pin, times=10, delay=0.1):
+        GPIO.setup(pin, GPIO.OUT)
+        self.pin = pin
+        self.scheduler = Scheduler()
+        self.timeline = blink(times, delay)
+
+    def handle(self, alarm):
+        self.scheduler.play(self.pin, self.timeline)
+
+    def close(self):
+        self.scheduler.shutdown()
+
+
+class LogSink:
+    name = "log"
+
+    def __init__(self, path):
+        self.file = open(path, "a", buffering=1)
+
+    def handle(self, alarm):
+        stamp = datetime.fromtimestamp(alarm.when).isoformat(timespec="milliseconds")
+        self.file.write(f"{stamp} {alarm.source}: {alarm.message}\n")
+
+    def close(self):
+        self.file.close()
+
+
+class WebhookSink:
+    name = "webhook"
+
+    def __init__(self, url, timeout=WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def handle(self, alarm):
+        body = json.dumps({"source": alarm.source, "message": alarm.message,
+                           "time": alarm.when}).encode()
+        request = urllib.request.Request(self.url, data=body,
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def close(self):
+        pass
+
+
+class SinkWorker:
+    """Queue, worker thread and metrics of one sink"""
+
+    def __init__(self, sink, queue_size=QUEUE_SIZE):
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.latency_sum = 0.0    # seconds, enqueue to delivered
+        self.latency_max = 0.0
+        self.last_error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def put(self, alarm):
+        try:
+            self.queue.put_nowait(alarm)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _run(self):
+        while True:
+            alarm = self.queue.get()
+            if alarm is None:
+                return
+            try:
+                self.sink.handle(alarm)
+            except Exception as e:
+                self.failed += 1
+                self.last_error = str(e)
+                continue
+            latency = (time.perf_counter_ns() - alarm.enqueued_ns) / 1e9
+            self.delivered += 1
+            self.latency_sum += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def stop(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.sink.close()
+
+    def metrics(self):
+        return {
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "latency_ms": self.latency_sum / self.delivered * 1000 if self.delivered else None,
+            "max_latency_ms": self.latency_max * 1000,
+            "last_error": self.last_error,
+        }
+
+
+class AlarmDispatcher:
+    def __init__(self, sinks, queue_size=QUEUE_SIZE):
+        self.workers = [SinkWorker(sink, queue_size) for sink in sinks]
+        self.raised = 0
+
+    def raise_alarm(self, source, message):
+        """Queue an alarm for every sink and return at once"""
+        alarm = Alarm(source, message, time.time(), time.perf_counter_ns())
+        self.raised += 1
+        for worker in self.workers:
+            worker.put(alarm)
+        return alarm
+
+    def metrics(self):
+        """{sink name: counters, queue depth and latency}"""
+        return {worker.sink.name: worker.metrics() for worker in self.workers}
+
+    def report(self):
+        """Metrics as printable lines"""
+        lines = [f"Alarms raised: {self.raised}"]
+        for name, m in self.metrics().items():
+            latency = "-" if m["latency_ms"] is None else f"{m['latency_ms']:.1f} ms"
+            line = (f"  {name:8} delivered {m['delivered']}, dropped {m['dropped']}, "
+                    f"failed {m['failed']}, max depth {m['max_depth']}, "
+                    f"latency {latency} (max {m['max_latency_ms']:.1f} ms)")
+            if m["last_error"]:
+                line += f" - {m['last_error']}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def close(self):
+        """Deliver what is queued, then stop the workers and sinks"""
+        for worker in self.workers:
+            worker.stop()
+
+
+def make_dispatcher(buzzer_pin=None, led_pin=None, log_path=None, webhook_url=None):
+    """Dispatcher with a sink for each output that is given"""
+    sinks = []
+    if buzzer_pin is not None:
+        sinks.append(BuzzerSink(buzzer_pin))
+    if led_pin is not None:
+        sinks.append(LEDSink(led_pin))
+    if log_path:
+        sinks.append(LogSink(log_path))
+    if webhook_url:
+        sinks.append(WebhookSink(webhook_url))
+    return AlarmDispatcher(sinks)
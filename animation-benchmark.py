@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Animation scheduler benchmark
+Plays square waves with different periods on 24 simulated pins (gpio_sim)
+and reports tick rate, lateness, dropped frames, CPU use and how far the
+pin edges drifted from their ideal times by the end of the run.
+"""
+
+import time
+
+import gpio_sim
+gpio_sim.install()
+
+import RPi.GPIO as GPIO
+from animation import Scheduler, square_wave, TICK_HZ
+
+CHANNELS = 24
+DURATION = 10.0
+FIRST_PIN = 2
+
+
+def main():
+    GPIO.setmode(GPIO.BCM)
+    pins = list(range(FIRST_PIN, FIRST_PIN + CHANNELS))
+    GPIO.setup(pins, GPIO.OUT)
+
+    scheduler = Scheduler()
+    halves = {pin: 0.05 + 0.01 * i for i, pin in enumerate(pins)}
+    gpio_sim.writes.clear()
+
+    print("\n=== Animation Scheduler Benchmark ===")
+    print(f"{CHANNELS} channels at {TICK_HZ} Hz for {DURATION:.0f} s\n")
+
+    cpu = time.process_time()
+    start = time.monotonic()
+    start_ns = time.perf_counter_ns()
+    scheduler.play_group({pin: square_wave(half, half) for pin, half in halves.items()}, start)
+    time.sleep(DURATION)
+    stop_ns = time.perf_counter_ns()
+    scheduler.shutdown()
+    cpu = time.process_time() - cpu
+    elapsed = time.monotonic() - start
+
+    # Edge error: every write against the ideal grid time of that edge
+    drift = []
+    for when, pin, level in gpio_sim.writes:
+        if pin not in halves or when >= stop_ns:
+            continue
+        t = (when - start_ns) / 1e9
+        half = halves[pin]
+        ideal = round(t / half) * half
+        drift.append(abs(t - ideal))
+    last_quarter = drift[len(drift) * 3 // 4:]
+
+    print(f"Ticks: {scheduler.ticks} ({scheduler.ticks / elapsed:.0f}/s), "
+          f"dropped frames: {scheduler.dropped}, worst lateness {scheduler.max_late * 1000:.2f} ms")
+    print(f"CPU: {cpu / elapsed * 100:.1f}% of a core")
+    print(f"Edge error: mean {sum(drift) / len(drift) * 1000:.2f} ms overall, "
+          f"{sum(last_quarter) / len(last_quarter) * 1000:.2f} ms in the last quarter, "
+          f"max {max(drift) * 1000:.2f} ms (tick is {1000 / TICK_HZ:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Frame-based animation scheduler for output pins
+Drives any number of pins from keyframe timelines in one background
+thread. Ticks fall on absolute monotonic deadlines (start + n / tick_hz)
+so timing never drifts; a late tick jumps to the current frame instead of
+trying to catch up one by one. All pin changes of a tick go out in a
+single GPIO.output call.
+
+  scheduler = Scheduler()
+  scheduler.play(LED_PIN, blink(times=5, delay=0.5)).wait()
+"""
+
+import time
+import threading
+
+import RPi.GPIO as GPIO
+
+TICK_HZ = 200
+
+
+class Timeline:
+    """Keyframes (seconds, level); a level holds until the next keyframe"""
+
+    def __init__(self, keyframes, length=None, loop=False):
+        keyframes = sorted(keyframes)
+        self.times = [when for when, _ in keyframes]
+        self.values = [GPIO.HIGH if value else GPIO.LOW for _, value in keyframes]
+        self.length = length if length is not None else self.times[-1]
+        self.loop = loop
+
+
+def blink(times=5, delay=0.5):
+    """On for delay, off for delay, times over"""
+    keyframes = []
+    for i in range(times):
+        keyframes += [(2 * i * delay, 1), ((2 * i + 1) * delay, 0)]
+    return Timeline(keyframes, length=2 * times * delay)
+
+
+def square_wave(on=0.5, off=0.5):
+    """Endless on/off cycle"""
+    return Timeline([(0, 1), (on, 0)], length=on + off, loop=True)
+
+
+class Channel:
+    """A timeline playing on one pin"""
+
+    def __init__(self, pin, timeline, start):
+        self.pin = pin
+        self.timeline = timeline
+        self.start = start
+        self.cursor = 0
+        self.level = None
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Block until a non-looping timeline has played out"""
+        return self.done.wait(timeout)
+
+    def level_at(self, now):
+        """Level at time now and whether the timeline has ended"""
+        timeline = self.timeline
+        t = now - self.start
+        ended = False
+        if timeline.loop and timeline.length > 0:
+            t %= timeline.length
+            if t < timeline.times[self.cursor]:
+                self.cursor = 0     # wrapped around
+        elif t >= timeline.length:
+            ended = True
+
+        times = timeline.times
+        cursor = self.cursor
+        while cursor + 1 < len(times) and times[cursor + 1] <= t:
+            cursor += 1
+        self.cursor = cursor
+        if t < times[0]:
+            return None, ended
+        return timeline.values[cursor], ended
+
+
+class Scheduler:
+    def __init__(self, tick_hz=TICK_HZ):
+        self.interval = 1.0 / tick_hz
+        self.channels = {}
+        self.ticks = 0
+        self.dropped = 0          # frames skipped because a tick ran late
+        self.max_late = 0.0       # worst tick lateness in seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopping = False
+
+    def play(self, pin, timeline, start=None):
+        """Start a timeline on a pin (replacing what it was playing)"""
+        return self.play_group({pin: timeline}, start)[pin]
+
+    def play_group(self, timelines, start=None):
+        """Start {pin: timeline} together, they share ticks from the first one"""
+        start = time.monotonic() if start is None else start
+        channels = {pin: Channel(pin, timeline, start) for pin, timeline in timelines.items()}
+        with self._lock:
+            for pin, channel in channels.items():
+                old = self.channels.get(pin)
+                if old:
+                    old.done.set()
+                self.channels[pin] = channel
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return channels
+
+    def stop(self, *pins, level=GPIO.LOW):
+        """Cancel the timelines on pins and leave them at level"""
+        with self._lock:
+            for pin in pins:
+                channel = self.channels.pop(pin, None)
+                if channel:
+                    channel.done.set()
+            if pins:
+                GPIO.output(list(pins), [level] * len(pins))
+
+    def shutdown(self):
+        """Stop the scheduler thread and every timeline"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.stop(*list(self.channels))
+
+    def _run(self):
+        origin = time.monotonic()
+        frame = 0
+        while not self._stopping:
+            with self._lock:
+                channels = list(self.channels.values())
+            if not channels:
+                self._wake.wait()
+                self._wake.clear()
+                origin = time.monotonic()
+                frame = 0
+                continue
+
+            # Evaluate and write under the lock so stop() can't be overwritten
+            with self._lock:
+                now = time.monotonic()
+                pins = []
+                levels = []
+                for channel in channels:
+                    level, ended = channel.level_at(now)
+                    if self.channels.get(channel.pin) is not channel:
+                        continue    # stopped or replaced since the snapshot
+                    if level is not None and level != channel.level:
+                        channel.level = level
+                        pins.append(channel.pin)
+                        levels.append(level)
+                    if ended:
+                        del self.channels[channel.pin]
+                        channel.done.set()
+                if pins:
+                    GPIO.output(pins, levels)
+            self.ticks += 1
+
+            # Next deadline on the absolute grid; drop frames we are past
+            frame += 1
+            deadline = origin + frame * self.interval
+            now = time.monotonic()
+            if now > deadline:
+                late = now - deadline
+                self.max_late = max(self.max_late, late)
+                skipped = int(late / self.interval)
+                self.dropped += skipped
+                frame += skipped
+                deadline = origin + frame * self.interval
+            self._wake.wait(max(deadline - now, 0))
+            self._wake.clear()
@@ -1,5 +1,6 @@
 import RPi.GPIO as GPIO
-import time
+
+from debounce import Debouncer
 
 # Define constants
 PIN_BUTTON = 18  # GPIO pin for button
@@ -8,25 +9,34 @@ GPIO.setmode(GPIO.BCM)
 GPIO.setwarnings(False)
 GPIO.setup(PIN_BUTTON, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
+# Debouncing happens on edge timestamps in the background, so the loop
+# below only waits for gestures and a held button blocks nothing
+buttons = Debouncer()
+buttons.add(PIN_BUTTON)
+
+MESSAGES = {
+    "press": "Button pressed!",
+    "release": "Button released",
+    "double_click": "Double click!",
+    "long_press": "Long press!",
+}
+
 try:
     print("Simple button test - one message per press")
+    print("Try a double click or holding the button")
     print("Press Ctrl+C to exit")
     
     while True:
-        if GPIO.input(PIN_BUTTON) == GPIO.LOW:
-            print("Button pressed!")
-            
-            # Wait for button release to avoid multiple detections
-            while GPIO.input(PIN_BUTTON) == GPIO.LOW:
-                time.sleep(0.01)
-            
-            # Small delay after release
-            time.sleep(0.1)
-        
-        time.sleep(0.01)
+        gesture = buttons.events.get()
+        if gesture.kind == "repeat":
+            print(f"  held... ({gesture.count})")
+        else:
+            print(MESSAGES[gesture.kind])
 
 except KeyboardInterrupt:
     print("\nProgram interrupted")
+    print(buttons.report())
 finally:
+    buttons.close()
     GPIO.cleanup()
     print("GPIO cleaned up")
\ No newline at end of file
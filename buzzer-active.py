@@ -1,27 +1,31 @@
 #!/usr/bin/env python3
 
 import RPi.GPIO as GPIO
+import sys
 import time
 
+from tone_patterns import Sequencer, PATTERNS
+
 BUZZER_PIN = 17
 
 GPIO.setmode(GPIO.BCM)
 GPIO.setup(BUZZER_PIN, GPIO.OUT)
 
+sequencer = Sequencer(BUZZER_PIN)
+
+# Pattern name from PATTERNS or a spec like "(100 ~100)x3 ~500"
+pattern = sys.argv[1] if len(sys.argv) > 1 else "beep"
+
 try:
     print("Active buzzer test - Press Ctrl+C to exit")
+    print(f"Playing {pattern!r}: {PATTERNS.get(pattern, pattern)}")
+    sequencer.play(pattern, repeat=0)
     while True:
-        print("Beep!")
-        # Turn on
-        GPIO.output(BUZZER_PIN, GPIO.HIGH)
-        time.sleep(0.5)
-        
-        print("Silent")
-        # Turn off
-        GPIO.output(BUZZER_PIN, GPIO.LOW)
-        time.sleep(0.5)
-        
+        time.sleep(1)
+
 except KeyboardInterrupt:
     print("\nStopping...")
 finally:
-    GPIO.cleanup()
\ No newline at end of file
+    sequencer.stop()
+    print(f"Edges: {sequencer.edges}, worst lateness {sequencer.max_late * 1000:.3f} ms")
+    GPIO.cleanup()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Debounce engine benchmark
+Plays the same bouncy button script on 32 simulated pins (gpio_sim) at
+staggered offsets: a click, a double click and a 1.3 s hold, every press
+and release with contact bounce. Checks that every pin gets exactly the
+expected gestures and reports latency per gesture kind and CPU use.
+Then plays single knock-sensor pulses, from 50 us to 3 ms, to leading
+edge inputs and checks that every pulse is one press and one release.
+Pass the number of rounds of the script:
+
+  python3 debounce-benchmark.py 10
+"""
+
+import sys
+import time
+import random
+
+import gpio_sim
+gpio_sim.install()
+
+import RPi.GPIO as GPIO
+from debounce import Debouncer
+
+PINS = range(2, 34)
+BOUNCE_US = [300, 150, 500, 200, 800]    # alternating contact bounce
+ROUND_MS = 3000
+
+# Per round: click, double click, 1.3 s hold (long press at 0.8 s,
+# repeats at 1.0 and 1.2 s)
+EXPECTED = {"press": 4, "release": 4, "double_click": 1, "long_press": 1, "repeat": 2}
+
+PULSE_US = [50, 200, 1000, 3000]    # knock and vibration sensor pulses
+PULSES = 10
+PULSE_GAP_MS = 300
+KNOCK_DEBOUNCE_MS = 150
+
+
+def press(hold_ms, gap_ms):
+    """Widths (us) of a bouncy press and release, starting LOW, ending HIGH"""
+    bounce = BOUNCE_US[:random.choice((2, 4))]
+    low = hold_ms * 1000 - sum(bounce)
+    high = gap_ms * 1000 - sum(bounce)
+    return bounce + [low] + bounce + [high]
+
+
+def script(rounds):
+    widths = []
+    for _ in range(rounds):
+        widths += press(100, 500)
+        widths += press(80, 70) + press(80, 500)
+        widths += press(1300, ROUND_MS - 600 - 730 - 1300)
+    return widths[:-1]      # stay released instead of toggling once more
+
+
+def run(rounds, leading):
+    buttons = Debouncer()
+    gestures = {pin: {} for pin in PINS}
+    def count(gesture):
+        kinds = gestures[gesture.pin]
+        kinds[gesture.kind] = kinds.get(gesture.kind, 0) + 1
+    for pin in PINS:
+        buttons.add(pin, handler=count, leading=leading)
+
+    gpio_sim.player_cpu = 0.0
+    start = time.perf_counter()
+    cpu = time.process_time()
+    players = [gpio_sim.play(pin, script(rounds), GPIO.LOW, delay=random.uniform(0, 0.5))
+               for pin in PINS]
+    for player in players:
+        player.join()
+    time.sleep(0.1)
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu - gpio_sim.player_cpu
+    buttons.close()
+
+    expected = {kind: count * rounds for kind, count in EXPECTED.items()}
+    wrong = [pin for pin in PINS if gestures[pin] != expected]
+    print(f"{'Leading' if leading else 'Trailing'} edge debounce")
+    print(buttons.report())
+    print(f"Pins with the wrong gestures: {len(wrong)} of {len(PINS)}"
+          + (f" (pin {wrong[0]}: {gestures[wrong[0]]})" if wrong else ""))
+    print(f"CPU {cpu / wall * 100:.1f}% (without the simulated buttons)\n")
+
+
+def run_pulses():
+    """Clean pulses shorter than the debounce time, one width per pin"""
+    buttons = Debouncer()
+    gestures = {pin: {} for pin in PINS[:len(PULSE_US)]}
+    def count(gesture):
+        kinds = gestures[gesture.pin]
+        kinds[gesture.kind] = kinds.get(gesture.kind, 0) + 1
+    for pin in gestures:
+        buttons.add(pin, handler=count, leading=True, debounce_ms=KNOCK_DEBOUNCE_MS, long_ms=None)
+
+    players = []
+    for pin, width in zip(gestures, PULSE_US):
+        widths = [width, PULSE_GAP_MS * 1000 - width] * PULSES
+        players.append(gpio_sim.play(pin, widths[:-1], GPIO.LOW))
+    for player in players:
+        player.join()
+    time.sleep(KNOCK_DEBOUNCE_MS / 1000 + 0.1)
+    buttons.close()
+
+    print(f"Leading edge, {KNOCK_DEBOUNCE_MS} ms debounce, {PULSES} single pulses per width")
+    for pin, width in zip(gestures, PULSE_US):
+        kinds = gestures[pin]
+        print(f"  {width:5} us pulse  presses {kinds.get('press', 0):2} of {PULSES}"
+              f"  releases {kinds.get('release', 0):2} of {PULSES}")
+    print()
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    random.seed(24)
+    GPIO.setmode(GPIO.BCM)
+    for pin in PINS:
+        GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+
+    print("\n=== Debounce Engine Benchmark ===")
+    print(f"{len(PINS)} pins, {rounds} rounds of click, double click and hold\n")
+    run(rounds, leading=False)
+    run(rounds, leading=True)
+    run_pulses()
+
+
+if __name__ == "__main__":
+    main()
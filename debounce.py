@@ -0,0 +1,247 @@
+"""
+Timestamp-based debounce and gesture engine
+One GPIO callback serves every registered input and only records the
+edge: its perf_counter_ns time and the new level. A single timer thread
+turns those into gestures once they are due, so nothing ever sleeps
+while a button is held and dozens of inputs share two threads.
+
+  press / release   the level has settled (trailing, the default: stable
+                    for debounce_ms) or the first edge (leading: then
+                    ignores bounces for debounce_ms, so even a pulse
+                    shorter than the callback latency counts)
+  double_click      a press within double_ms of the previous press
+  long_press        held for long_ms
+  repeat            every repeat_ms while still held after a long press
+
+Latency (first edge to event, or deadline to event for timed gestures)
+is measured per kind, see stats() and report().
+
+  buttons = Debouncer()
+  buttons.add(18, handler=lambda g: print(g.kind))
+  buttons.add(17, leading=True, debounce_ms=150)
+  buttons.events.get()      # gestures of inputs without a handler
+"""
+
+import heapq
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import RPi.GPIO as GPIO
+
+DEBOUNCE_MS = 20     # settle time (trailing) or bounce lockout (leading)
+DOUBLE_MS = 300      # most time between the presses of a double click
+LONG_MS = 800        # hold time of a long press
+REPEAT_MS = 200      # repeat interval while held after a long press
+
+PRESS = "press"
+RELEASE = "release"
+DOUBLE_CLICK = "double_click"
+LONG_PRESS = "long_press"
+REPEAT = "repeat"
+
+# when_ns: the first edge for press/release/double_click, else the deadline
+# count: 2 for a double click, the repeat number for repeat, otherwise 1
+Gesture = namedtuple("Gesture", "pin kind when_ns latency_ns count")
+
+_SETTLE = 0
+_LONG = 1
+_REPEAT = 2
+
+
+class Input:
+    """Configuration and debounce state of one pin"""
+
+    def __init__(self, pin, handler, active, leading, debounce_ms, double_ms, long_ms, repeat_ms):
+        self.pin = pin
+        self.handler = handler
+        self.active = active
+        self.leading = leading
+        self.debounce_ns = int(debounce_ms * 1e6)
+        self.double_ns = int(double_ms * 1e6)
+        self.long_ns = int(long_ms * 1e6) if long_ms else None
+        self.repeat_ns = int(repeat_ms * 1e6) if repeat_ms else None
+        self.stable = GPIO.input(pin)
+        self.raw = self.stable
+        self.raw_ns = 0
+        self.pending_ns = None     # first edge of a change not yet confirmed
+        self.locked_ns = 0         # leading: no change confirmed before this
+        self.last_press_ns = None
+        self.hold = 0              # bumped on release, cancels long/repeat timers
+        self.repeats = 0
+
+    def due(self):
+        """When the pending change can be confirmed"""
+        if self.leading:
+            return max(self.pending_ns, self.locked_ns)
+        return self.raw_ns + self.debounce_ns
+
+
+class Debouncer:
+    def __init__(self, handler=None, debounce_ms=DEBOUNCE_MS, double_ms=DOUBLE_MS,
+                 long_ms=LONG_MS, repeat_ms=REPEAT_MS):
+        self.handler = handler       # default for inputs added without one
+        self.defaults = dict(debounce_ms=debounce_ms, double_ms=double_ms,
+                             long_ms=long_ms, repeat_ms=repeat_ms)
+        self.events = queue.SimpleQueue()   # gestures nobody handles
+        self.inputs = {}
+        self.edges = 0
+        self.counts = {}             # kind -> events
+        self.latency_sum = {}        # kind -> ns
+        self.latency_max = {}
+        self.failed = 0              # handler calls that raised
+        self.last_error = None
+        self._timers = []            # heap of (due_ns, seq, input, kind, hold)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, pin, handler=None, active=GPIO.LOW, leading=False, **timing):
+        """
+        Watch a pin (already set up as an input); active is the pressed
+        level. timing overrides debounce_ms, double_ms, long_ms, repeat_ms;
+        long_ms=None turns off long press and repeat.
+        """
+        settings = dict(self.defaults, **timing)
+        self.inputs[pin] = Input(pin, handler or self.handler, active, leading, **settings)
+        GPIO.add_event_detect(pin, GPIO.BOTH, callback=self._on_edge)
+
+    def remove(self, pin):
+        GPIO.remove_event_detect(pin)
+        with self._cond:
+            self.inputs.pop(pin, None)
+
+    def _on_edge(self, channel):
+        now = time.perf_counter_ns()
+        level = GPIO.input(channel)
+        with self._cond:
+            inp = self.inputs.get(channel)
+            if inp is None:
+                return
+            self.edges += 1
+            if inp.leading and level == inp.raw:
+                # Pulse shorter than the callback latency: the level read back
+                # already flipped again, but every edge is a change
+                level ^= 1
+            inp.raw = level
+            inp.raw_ns = now
+            if level == inp.stable:
+                # Bounced back before settling; leading mode keeps a first
+                # edge that came after the lockout, it is the press itself
+                if not inp.leading or inp.pending_ns is None or inp.pending_ns < inp.locked_ns:
+                    inp.pending_ns = None
+                return
+            if inp.pending_ns is None:
+                inp.pending_ns = now
+            self._schedule(inp.due(), inp, _SETTLE, inp.hold)
+
+    def _schedule(self, due_ns, inp, kind, hold):
+        self._seq += 1
+        heapq.heappush(self._timers, (due_ns, self._seq, inp, kind, hold))
+        if self._timers[0][1] == self._seq:
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                gestures = self._due()
+                while not gestures and self._running:
+                    timeout = None
+                    if self._timers:
+                        timeout = max(0, self._timers[0][0] - time.perf_counter_ns()) / 1e9
+                    self._cond.wait(timeout)
+                    gestures = self._due()
+            # Handlers run outside the lock so they can't hold up the callback
+            for handler, gesture in gestures:
+                if handler is None:
+                    self.events.put(gesture)
+                    continue
+                # A failing handler must not stop the other inputs
+                try:
+                    handler(gesture)
+                except Exception as e:
+                    self.failed += 1
+                    self.last_error = f"pin {gesture.pin} {gesture.kind}: {e}"
+            if not self._running:
+                return
+
+    def _due(self):
+        """Fire every timer that is due, returns [(handler, gesture)]"""
+        gestures = []
+        now = time.perf_counter_ns()
+        while self._timers and self._timers[0][0] <= now:
+            due, _, inp, kind, hold = heapq.heappop(self._timers)
+            if self.inputs.get(inp.pin) is not inp:
+                continue
+            if kind == _SETTLE:
+                # Stale unless this is still the pending change's deadline
+                if inp.pending_ns is not None and inp.due() <= now:
+                    self._settle(inp, now, gestures)
+            elif hold == inp.hold and inp.stable == inp.active:
+                if kind == _LONG:
+                    self._emit(inp, LONG_PRESS, due, now, 1, gestures)
+                else:
+                    inp.repeats += 1
+                    self._emit(inp, REPEAT, due, now, inp.repeats, gestures)
+                if inp.repeat_ns:
+                    self._schedule(due + inp.repeat_ns, inp, _REPEAT, hold)
+        return gestures
+
+    def _settle(self, inp, now, gestures):
+        started = inp.pending_ns
+        # Leading: the raw level may have flipped back already
+        inp.stable = inp.stable ^ 1 if inp.leading else inp.raw
+        inp.pending_ns = None
+        inp.locked_ns = started + inp.debounce_ns
+        if inp.leading and inp.raw != inp.stable:
+            # Already back, confirmed once the lockout is over
+            inp.pending_ns = inp.raw_ns
+            self._schedule(inp.due(), inp, _SETTLE, inp.hold)
+        if inp.stable != inp.active:
+            inp.hold += 1
+            self._emit(inp, RELEASE, started, now, 1, gestures)
+            return
+        self._emit(inp, PRESS, started, now, 1, gestures)
+        if inp.last_press_ns is not None and started - inp.last_press_ns <= inp.double_ns:
+            self._emit(inp, DOUBLE_CLICK, started, now, 2, gestures)
+            inp.last_press_ns = None    # a third press starts a new pair
+        else:
+            inp.last_press_ns = started
+        inp.repeats = 0
+        if inp.long_ns:
+            self._schedule(started + inp.long_ns, inp, _LONG, inp.hold)
+
+    def _emit(self, inp, kind, when_ns, now, count, gestures):
+        latency = now - when_ns
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.latency_sum[kind] = self.latency_sum.get(kind, 0) + latency
+        self.latency_max[kind] = max(self.latency_max.get(kind, 0), latency)
+        gestures.append((inp.handler, Gesture(inp.pin, kind, when_ns, latency, count)))
+
+    def stats(self):
+        """{kind: (count, mean latency ms, max latency ms)}"""
+        with self._cond:
+            return {kind: (count, self.latency_sum[kind] / count / 1e6,
+                           self.latency_max[kind] / 1e6)
+                    for kind, count in self.counts.items()}
+
+    def report(self):
+        """Stats as printable lines"""
+        lines = [f"Edges: {self.edges}"]
+        if self.failed:
+            lines[0] += f", failed handler calls: {self.failed} - {self.last_error}"
+        for kind, (count, mean, worst) in self.stats().items():
+            lines.append(f"  {kind:13} {count:6}  latency {mean:.2f} ms (max {worst:.2f} ms)")
+        return "\n".join(lines)
+
+    def close(self):
+        """Stop watching every pin and stop the timer thread"""
+        for pin in list(self.inputs):
+            self.remove(pin)
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
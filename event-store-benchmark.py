@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Event store benchmark
+Records a burst of events as fast as possible, then a sustained paced
+stream, and reports how long record() held up the caller, how fast the
+background writer got them into SQLite and how quick the time-indexed
+queries are.
+"""
+
+import os
+import time
+import tempfile
+
+from event_store import EventStore
+
+BURST = 50000
+RATE = 5000
+SECONDS = 5
+SENSORS = ("sw420", "knock", "tilt", "ir")
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "events.db")
+    store = EventStore(path)
+
+    print("\n=== Event Store Benchmark ===")
+    print(f"Events from {len(SENSORS)} sensors\n")
+
+    # Burst: as fast as the caller can, to find the writer's throughput
+    base = time.time() - 3600
+    start = time.perf_counter()
+    for i in range(BURST):
+        store.record(SENSORS[i % len(SENSORS)], "event", i, base + i * 3600 / BURST)
+    recorded = time.perf_counter() - start
+    store.flush()
+    written = time.perf_counter() - start
+    print(f"Burst of {BURST:,}: record() {recorded / BURST * 1e6:.1f} us mean, "
+          f"writer {BURST / written:,.0f} events/s, dropped {store.dropped}")
+
+    # Sustained: RATE events/s from a paced loop, like a busy sampler
+    worst = 0
+    start = time.monotonic()
+    for i in range(RATE * SECONDS):
+        if i % 10 == 0:
+            delay = start + i / RATE - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        t = time.perf_counter_ns()
+        store.record(SENSORS[i % len(SENSORS)], "event", i)
+        worst = max(worst, time.perf_counter_ns() - t)
+    store.flush()
+    print(f"{RATE:,}/s for {SECONDS} s: record() worst {worst / 1000:.0f} us, "
+          f"dropped {store.dropped}, {store.batches} transactions in total")
+
+    start = time.perf_counter()
+    rows = store.query(start=base + 600, end=base + 660, sensor="tilt")
+    ranged = time.perf_counter() - start
+    start = time.perf_counter()
+    buckets = store.counts("minute", sensor="sw420")
+    counted = time.perf_counter() - start
+    print(f"1 minute range for one sensor: {len(rows)} rows in {ranged * 1000:.1f} ms")
+    print(f"Counts per minute for one sensor: {len(buckets)} buckets in {counted * 1000:.1f} ms")
+
+    store.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
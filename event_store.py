@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Persistent, time-indexed sensor event store
+Events go into a SQLite database in WAL mode. record() only puts the event
+on a bounded queue and returns; a background writer takes whatever has
+queued up and inserts it in one transaction, so the sampling loop never
+waits on the disk. Events are indexed by time and by sensor, can be
+queried by range or counted per minute/hour, and anything older than the
+retention period is pruned by the writer once an hour.
+
+  store = EventStore()
+  store.record("sw420", "movement")
+  store.counts("hour", sensor="sw420")
+  store.close()
+
+  python3 event_store.py recent|counts [minute|hour]|prune [days]
+"""
+
+import sys
+import time
+import queue
+import sqlite3
+import threading
+from contextlib import closing
+
+DB_FILE = "events.db"
+QUEUE_SIZE = 100000     # events waiting for the writer before dropping
+BATCH_SIZE = 20000      # most events per transaction
+FLUSH_INTERVAL = 0.1    # seconds the writer collects events per transaction
+RETENTION_DAYS = 30
+PRUNE_INTERVAL = 3600   # seconds between retention passes
+
+BUCKETS = {"minute": 60, "hour": 3600, "day": 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    sensor TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_sensor_ts ON events (sensor, ts);
+"""
+
+
+class EventStore:
+    def __init__(self, path=DB_FILE, retention_days=RETENTION_DAYS, queue_size=QUEUE_SIZE):
+        self.path = path
+        self.retention_days = retention_days
+        self.written = 0
+        self.dropped = 0         # events lost because the queue was full
+        self.batches = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        with closing(self._connect()) as db:
+            db.executescript(SCHEMA)
+
+        # Reads get their own connection; WAL lets them run during writes
+        self._reader = self._connect(check_same_thread=False)
+        self._read_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _connect(self, check_same_thread=True):
+        db = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def record(self, sensor, kind, value=None, when=None):
+        """Queue an event (when = unix time, default now); never blocks"""
+        try:
+            self._queue.put_nowait((time.time() if when is None else when, sensor, kind, value))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout=None):
+        """Wait until everything recorded so far is in the database"""
+        # The writer sets the marker once the batch it ends up in is written
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self):
+        """Write what is queued and stop the writer"""
+        self._queue.put(None)
+        self._thread.join()
+        self._reader.close()
+
+    def _run(self):
+        db = self._connect()
+        self._prune(db)
+        next_prune = time.monotonic() + PRUNE_INTERVAL
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=1.0)]
+            except queue.Empty:
+                batch = []
+            # Let events pile up for a moment (spares the SD card), then
+            # take whatever queued up meanwhile, one transaction for all
+            if batch and type(batch[0]) is tuple:
+                time.sleep(FLUSH_INTERVAL)
+            while batch and len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            events = [item for item in batch if type(item) is tuple]
+            if events:
+                with db:
+                    db.executemany("INSERT INTO events (ts, sensor, kind, value) VALUES (?, ?, ?, ?)",
+                                   events)
+                self.written += len(events)
+                self.batches += 1
+            for item in batch:
+                if item is None:
+                    stopping = True
+                elif type(item) is not tuple:
+                    item.set()
+            if time.monotonic() >= next_prune:
+                self._prune(db)
+                next_prune += PRUNE_INTERVAL
+        db.close()
+
+    def _prune(self, db):
+        if self.retention_days:
+            with db:
+                db.execute("DELETE FROM events WHERE ts < ?",
+                           (time.time() - self.retention_days * 86400,))
+
+    def _read(self, sql, args):
+        with self._read_lock:
+            return self._reader.execute(sql, args).fetchall()
+
+    def _where(self, start, end, sensor, kind):
+        clauses = []
+        args = []
+        for clause, arg in (("ts >= ?", start), ("ts < ?", end),
+                            ("sensor = ?", sensor), ("kind = ?", kind)):
+            if arg is not None:
+                clauses.append(clause)
+                args.append(arg)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def query(self, start=None, end=None, sensor=None, kind=None, limit=None):
+        """(ts, sensor, kind, value) rows in a time range, oldest first"""
+        where, args = self._where(start, end, sensor, kind)
+        sql = "SELECT ts, sensor, kind, value FROM events" + where + " ORDER BY ts"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return self._read(sql, args)
+
+    def recent(self, limit=20):
+        """The newest limit events, oldest first"""
+        rows = self._read("SELECT ts, sensor, kind, value FROM events ORDER BY ts DESC LIMIT ?", [limit])
+        return rows[::-1]
+
+    def counts(self, bucket="minute", start=None, end=None, sensor=None, kind=None):
+        """(bucket start, sensor, count) rows per minute/hour/day and sensor"""
+        size = BUCKETS[bucket]
+        where, args = self._where(start, end, sensor, kind)
+        sql = (f"SELECT CAST(ts / {size} AS INTEGER) * {size} AS bucket, sensor, COUNT(*)"
+               f" FROM events{where} GROUP BY bucket, sensor ORDER BY bucket, sensor")
+        return self._read(sql, args)
+
+    def prune(self, days=None):
+        """Delete events older than days (default: the retention period)"""
+        self.flush()
+        days = self.retention_days if days is None else days
+        # closing() closes the connection, its own with only commits
+        with closing(sqlite3.connect(self.path)) as db, db:
+            cursor = db.execute("DELETE FROM events WHERE ts < ?", (time.time() - days * 86400,))
+            return cursor.rowcount
+
+
+def main():
+    commands = ("recent", "counts", "prune")
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print("Usage: event_store.py recent")
+        print("       event_store.py counts [minute|hour|day]")
+        print("       event_store.py prune [days]")
+        sys.exit(1)
+
+    store = EventStore()
+    command = sys.argv[1]
+    if command == "recent":
+        for ts, sensor, kind, value in store.recent():
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+            print(f"{stamp}  {sensor:10} {kind}" + ("" if value is None else f" {value:g}"))
+    elif command == "counts":
+        bucket = sys.argv[2] if len(sys.argv) > 2 else "hour"
+        for start, sensor, count in store.counts(bucket):
+            stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(start))
+            print(f"{stamp}  {sensor:10} {count}")
+    else:
+        days = float(sys.argv[2]) if len(sys.argv) > 2 else None
+        print(f"Pruned {store.prune(days)} events")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
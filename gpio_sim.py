@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Scripted stand-in for RPi.GPIO
+Lets the scripts and benchmarks run on any Linux box. Input pins follow
+scripted pulse trains played in real time, edge callbacks are dispatched
+from a separate thread like RPi.GPIO does, and every output write is
+logged with a perf_counter_ns timestamp.
+
+    import gpio_sim
+    gpio_sim.install()        # before "import RPi.GPIO as GPIO"
+"""
+
+import sys
+import time
+import queue
+import threading
+
+BCM = 11
+BOARD = 10
+IN = 1
+OUT = 0
+LOW = 0
+HIGH = 1
+PUD_OFF = 20
+PUD_DOWN = 21
+PUD_UP = 22
+RISING = 31
+FALLING = 32
+BOTH = 33
+
+# Last stretch of every scripted wait is spun instead of slept
+SPIN_NS = 200_000
+
+_levels = {}
+_directions = {}
+_detect = {}
+_lock = threading.Lock()
+_events = queue.SimpleQueue()
+_dispatcher = None
+
+# (perf_counter_ns, channel, value) for every GPIO.output call
+writes = []
+# channel -> perf_counter_ns of every scripted transition
+truth = {}
+# CPU seconds spent by the player threads (not part of the code under test)
+player_cpu = 0.0
+
+
+def install():
+    """Register this module as RPi.GPIO"""
+    package = type(sys)("RPi")
+    package.GPIO = sys.modules[__name__]
+    sys.modules["RPi"] = package
+    sys.modules["RPi.GPIO"] = sys.modules[__name__]
+
+
+def setmode(mode):
+    pass
+
+
+def setwarnings(flag):
+    pass
+
+
+def _channels(channel):
+    return list(channel) if isinstance(channel, (list, tuple)) else [channel]
+
+
+def setup(channel, direction, pull_up_down=PUD_OFF, initial=None):
+    for ch in _channels(channel):
+        _directions[ch] = direction
+        if direction == IN:
+            _levels.setdefault(ch, HIGH if pull_up_down == PUD_UP else LOW)
+        else:
+            _levels[ch] = LOW if initial is None else initial
+
+
+def input(channel):
+    return _levels.get(channel, LOW)
+
+
+def output(channel, value):
+    chans = _channels(channel)
+    values = _channels(value) if isinstance(value, (list, tuple)) else [value] * len(chans)
+    now = time.perf_counter_ns()
+    for ch, val in zip(chans, values):
+        level = HIGH if val else LOW
+        _levels[ch] = level
+        writes.append((now, ch, level))
+
+
+def _dispatch():
+    while True:
+        channel = _events.get()
+        with _lock:
+            callbacks = list(_detect.get(channel, {}).get("callbacks", ()))
+        for callback in callbacks:
+            callback(channel)
+
+
+def add_event_detect(channel, edge, callback=None, bouncetime=None):
+    global _dispatcher
+    with _lock:
+        if channel in _detect:
+            raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+        _detect[channel] = {"edge": edge, "callbacks": [callback] if callback else [],
+                            "flag": False}
+        if _dispatcher is None:
+            _dispatcher = threading.Thread(target=_dispatch, daemon=True)
+            _dispatcher.start()
+
+
+def add_event_callback(channel, callback):
+    with _lock:
+        if channel not in _detect:
+            raise RuntimeError("Add event detection using add_event_detect first before adding a callback")
+        _detect[channel]["callbacks"].append(callback)
+
+
+def remove_event_detect(channel):
+    with _lock:
+        _detect.pop(channel, None)
+
+
+def event_detected(channel):
+    with _lock:
+        entry = _detect.get(channel)
+        if entry and entry["flag"]:
+            entry["flag"] = False
+            return True
+    return False
+
+
+def cleanup(channel=None):
+    with _lock:
+        for ch in (_channels(channel) if channel is not None else list(_directions)):
+            _detect.pop(ch, None)
+            _directions.pop(ch, None)
+
+
+def set_input(channel, level):
+    """Drive an input pin now, firing edge detection like real hardware"""
+    level = HIGH if level else LOW
+    if _levels.get(channel) == level:
+        return
+    _levels[channel] = level
+    truth.setdefault(channel, []).append(time.perf_counter_ns())
+    with _lock:
+        entry = _detect.get(channel)
+        if entry is None:
+            return
+        edge = entry["edge"]
+        if edge == BOTH or (edge == RISING) == (level == HIGH):
+            entry["flag"] = True
+            _events.put(channel)
+
+
+def _wait_until(deadline_ns):
+    remaining = deadline_ns - time.perf_counter_ns()
+    if remaining > SPIN_NS:
+        time.sleep((remaining - SPIN_NS) / 1e9)
+    while time.perf_counter_ns() < deadline_ns:
+        pass
+
+
+def play(channel, pulses_us, start_level=LOW, delay=0.0):
+    """
+    Play a pulse train on an input pin in a background thread.
+    The pin goes to start_level after delay seconds and toggles after each
+    pulse width (microseconds). Returns the player thread.
+    """
+    def run():
+        global player_cpu
+        cpu = time.thread_time()
+        when = time.perf_counter_ns() + int(delay * 1e9)
+        level = start_level
+        for width in [0] + list(pulses_us):
+            when += int(width * 1000)
+            _wait_until(when)
+            set_input(channel, level)
+            level ^= 1
+        player_cpu += time.thread_time() - cpu
+
+    player = threading.Thread(target=run, daemon=True)
+    player.start()
+    return player
+
+
+class PWM:
+    """Software stand-in for GPIO.PWM that logs duty-cycle changes"""
+
+    def __init__(self, channel, frequency):
+        self.channel = channel
+        self.frequency = frequency
+        self.duty_cycle = 0.0
+        self.running = False
+        self.changes = []
+
+    def start(self, duty_cycle):
+        self.running = True
+        self.ChangeDutyCycle(duty_cycle)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        if not 0.0 <= duty_cycle <= 100.0:
+            raise ValueError("dutycycle must have a value from 0.0 to 100.0")
+        self.duty_cycle = duty_cycle
+        self.changes.append((time.perf_counter_ns(), duty_cycle))
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+
+    def stop(self):
+        self.running = False
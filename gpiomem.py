@@ -0,0 +1,149 @@
+"""
+Memory-mapped GPIO fast path through /dev/gpiomem
+Maps the BCM283x/BCM2711 GPIO register block and touches whole 32-pin
+banks with single register accesses: one GPLEV read samples every pin of
+a bank, one GPSET and one GPCLR write change any number of outputs. The
+calls keep the RPi.GPIO shape (setup, input, output with a pin or a list
+of pins) so a script can swap it in for level I/O and keep RPi.GPIO for
+pulls, PWM and edge detection. Pi 5 GPIO sits behind RP1 and is not
+covered.
+
+  fast = gpiomem.open_gpiomem() or GPIO
+  fast.output([PIN_RED, PIN_GREEN, PIN_BLUE], [1, 0, 1])
+
+FileGPIOMem runs the same register logic on a plain file, so it works on
+any Linux box.
+"""
+
+import os
+import mmap
+
+GPIOMEM = "/dev/gpiomem"
+BLOCK_SIZE = 4096
+
+BCM = 11
+IN = 1
+OUT = 0
+LOW = 0
+HIGH = 1
+PUD_OFF = 20
+
+# Register word offsets (byte offset / 4)
+GPFSEL0 = 0x00 // 4
+GPSET0 = 0x1C // 4
+GPCLR0 = 0x28 // 4
+GPLEV0 = 0x34 // 4
+
+PINS = 54
+
+
+def _channels(channel):
+    return list(channel) if isinstance(channel, (list, tuple)) else [channel]
+
+
+class GPIOMem:
+    def __init__(self, path=GPIOMEM):
+        self._fd = os.open(path, os.O_RDWR | os.O_SYNC)
+        self._map = mmap.mmap(self._fd, BLOCK_SIZE, mmap.MAP_SHARED,
+                              mmap.PROT_READ | mmap.PROT_WRITE)
+        # 32-bit view so every access is one aligned register load/store
+        self.regs = memoryview(self._map).cast("I")
+
+    def setmode(self, mode):
+        if mode != BCM:
+            raise ValueError("gpiomem only supports BCM numbering")
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, channel, direction, pull_up_down=PUD_OFF, initial=None):
+        """Set pin functions to input or output (pulls stay with RPi.GPIO)"""
+        if pull_up_down != PUD_OFF:
+            raise ValueError("Set pull-ups with RPi.GPIO, gpiomem only does levels")
+        for pin in _channels(channel):
+            self._check(pin)
+            if direction == OUT and initial is not None:
+                self.output(pin, initial)
+            word = GPFSEL0 + pin // 10
+            shift = (pin % 10) * 3
+            mode = 0b001 if direction == OUT else 0b000
+            self.regs[word] = (self.regs[word] & ~(0b111 << shift)) | (mode << shift)
+
+    def input(self, channel):
+        """Level of one pin"""
+        self._check(channel)
+        return (self.regs[GPLEV0 + channel // 32] >> (channel % 32)) & 1
+
+    def input_bank(self, bank=0):
+        """Levels of all 32 pins of a bank as a bit mask, in one read"""
+        return self.regs[GPLEV0 + bank]
+
+    def output(self, channel, value):
+        """Drive a pin or a list of pins, one set and one clear write per bank"""
+        pins = _channels(channel)
+        values = _channels(value) if isinstance(value, (list, tuple)) else [value] * len(pins)
+        if len(values) != len(pins):
+            raise ValueError("Number of channels != number of values")
+        # Both banks as one 64-bit mask, split at the end
+        set_mask = clear_mask = 0
+        for pin, val in zip(pins, values):
+            if val:
+                set_mask |= 1 << pin
+            else:
+                clear_mask |= 1 << pin
+        if (set_mask | clear_mask) >> PINS:
+            raise ValueError(f"The channel sent is invalid: {pins}")
+        self.output_bank(set_mask & 0xFFFFFFFF, clear_mask & 0xFFFFFFFF, 0)
+        if (set_mask | clear_mask) >> 32:
+            self.output_bank(set_mask >> 32, clear_mask >> 32, 1)
+
+    def output_bank(self, set_mask, clear_mask=0, bank=0):
+        """Raise the pins in set_mask and lower those in clear_mask"""
+        if set_mask:
+            self._write(GPSET0 + bank, set_mask)
+        if clear_mask:
+            self._write(GPCLR0 + bank, clear_mask)
+
+    def _write(self, word, mask):
+        self.regs[word] = mask
+
+    @staticmethod
+    def _check(pin):
+        if not 0 <= pin < PINS:
+            raise ValueError(f"The channel sent is invalid: {pin}")
+
+    def cleanup(self, channel=None):
+        """Unmap the registers (pin states are left alone)"""
+        self.regs.release()
+        self._map.close()
+        os.close(self._fd)
+
+
+class FileGPIOMem(GPIOMem):
+    """
+    GPIOMem on a file-backed mmap. Writes to GPSET/GPCLR are folded into
+    GPLEV the way the hardware does, so levels read back as written.
+    """
+
+    def __init__(self, path):
+        if not os.path.exists(path) or os.path.getsize(path) < BLOCK_SIZE:
+            with open(path, "wb") as f:
+                f.write(bytes(BLOCK_SIZE))
+        super().__init__(path)
+
+    def _write(self, word, mask):
+        self.regs[word] = mask
+        if GPSET0 <= word < GPSET0 + 2:
+            level = GPLEV0 + word - GPSET0
+            self.regs[level] |= mask
+        elif GPCLR0 <= word < GPCLR0 + 2:
+            level = GPLEV0 + word - GPCLR0
+            self.regs[level] &= ~mask & 0xFFFFFFFF
+
+
+def open_gpiomem(path=GPIOMEM):
+    """GPIOMem on the real registers, or None if they can't be mapped"""
+    try:
+        return GPIOMem(path)
+    except OSError:
+        return None
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+IR capture benchmark - edge callbacks vs. busy polling
+Plays a scripted NEC frame on a simulated pin (gpio_sim) and compares the
+CPU time each capture path burns and how far its pulse widths are from
+the scripted edge times. Runs on any Linux box, no Pi needed.
+"""
+
+import sys
+import time
+
+import gpio_sim
+gpio_sim.install()
+
+import ir
+
+IR_PIN = 18
+ROUNDS = 5
+
+
+def nec_frame(address=0x04, command=0x08):
+    """Pulse widths (us) of one NEC frame"""
+    pulses = [9000, 4500]
+    data = address | (~address & 0xFF) << 8 | command << 16 | (~command & 0xFF) << 24
+    for bit in range(32):
+        pulses += [562, 1687 if data >> bit & 1 else 562]
+    return pulses + [562]
+
+
+def run_capture(learner, frame):
+    """Capture one frame, returns (pulses, cpu seconds, scripted pulse widths)"""
+    gpio_sim.set_input(IR_PIN, gpio_sim.HIGH)
+    gpio_sim.truth[IR_PIN] = []
+    player_cpu = gpio_sim.player_cpu
+
+    cpu = time.process_time()
+    player = gpio_sim.play(IR_PIN, frame, delay=0.05)
+    pulses = learner.capture_ir_signal(timeout=2)
+    player.join()
+    cpu = time.process_time() - cpu - (gpio_sim.player_cpu - player_cpu)
+
+    edges = gpio_sim.truth[IR_PIN]
+    scripted = [(b - a) / 1000 for a, b in zip(edges, edges[1:])]
+    return pulses, cpu, scripted
+
+
+def main():
+    # Let the player thread get the GIL back quickly so the scripted
+    # waveform stays close to real hardware while the poller spins
+    sys.setswitchinterval(1e-5)
+    frame = nec_frame()
+    learner = ir.IRLearner(ir_pin=IR_PIN)
+
+    print("\n=== IR Capture Benchmark ===")
+    print(f"NEC frame, {len(frame)} pulses, {ROUNDS} rounds per mode\n")
+
+    for mode in ("poll", "edge"):
+        learner.capture_mode = mode
+        cpu_total = 0.0
+        wall_total = 0.0
+        errors = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            pulses, cpu, scripted = run_capture(learner, frame)
+            wall_total += time.perf_counter() - start
+            cpu_total += cpu
+            if not pulses:
+                print(f"{mode}: capture failed")
+                continue
+            n = min(len(pulses), len(scripted))
+            errors += [abs(p - s) for p, s in zip(pulses[:n], scripted[:n])]
+
+        if errors:
+            mean = sum(errors) / len(errors)
+            print(f"{mode:>4}: CPU {cpu_total / wall_total * 100:5.1f}% of a core, "
+                  f"pulse error mean {mean:6.1f} us, max {max(errors):7.1f} us")
+
+    learner.cleanup()
+
+
+if __name__ == "__main__":
+    main()
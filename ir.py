@@ -1,19 +1,44 @@
 import RPi.GPIO as GPIO
+import os
 import time
-import json
+import queue
 from datetime import datetime
 
+import ir_decode
+from ir_capture import EdgeCapture
+from ir_consensus import consensus
+from ir_index import CodeIndex
+from ir_store import IRCodeStore
+from ir_stream import StreamDecoder
+from ir_transmit import IRTransmitter, PigpioBackend
+
+CODES_FILE = "learned_ir_codes.irc"
+LEGACY_CODES_FILE = "learned_ir_codes.json"  # imported once if found
+
 class IRLearner:
-    def __init__(self, ir_pin=18):
+    def __init__(self, ir_pin=18, capture_mode="edge", tx_pin=None):
         self.ir_pin = ir_pin
+        self.tx_pin = tx_pin  # IR LED driver, None if not fitted
+        self.capture_mode = capture_mode  # "edge" (interrupts) or "poll"
+        self.transmitter = None
         self.learned_codes = {}
+        self.index = None  # rebuilt on demand after learned_codes changes
         GPIO.setmode(GPIO.BCM)
         GPIO.setup(self.ir_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        self.edge_capture = EdgeCapture(self.ir_pin)
     
     def capture_ir_signal(self, timeout=10):
         """Capture raw IR signal timings"""
         print(f"Ready to learn IR signal. Press button within {timeout} seconds...")
         
+        if self.capture_mode == "edge":
+            pulses = self.edge_capture.capture(timeout)
+            return pulses if pulses and len(pulses) > 10 else None
+        
+        return self.poll_ir_signal(timeout)
+    
+    def poll_ir_signal(self, timeout=10):
+        """Capture raw IR signal timings by busy-polling the pin"""
         start_time = time.time()
         pulses = []
         
@@ -43,14 +68,14 @@ class IRLearner:
         
         return pulses if len(pulses) > 10 else None
     
-    def learn_command(self, command_name):
+    def learn_command(self, command_name, sample_count=3):
         """Learn a specific IR command"""
         print(f"\nLearning command: {command_name}")
         
         # Capture multiple samples for accuracy
         samples = []
-        for i in range(3):
-            print(f"Sample {i+1}/3 - Press the button now...")
+        for i in range(sample_count):
+            print(f"Sample {i+1}/{sample_count} - Press the button now...")
             signal = self.capture_ir_signal()
             if signal:
                 samples.append(signal)
@@ -60,56 +85,135 @@ class IRLearner:
                 print("Failed to capture signal")
                 return False
         
-        if len(samples) >= 2:
-            # Use the first successful capture
-            self.learned_codes[command_name] = {
-                'pulses': samples[0],
-                'learned_at': datetime.now().isoformat(),
-                'protocol': self.detect_protocol(samples[0])
-            }
-            print(f"Successfully learned command: {command_name}")
-            return True
-        else:
-            print(f"Failed to learn command: {command_name}")
+        # Median of the samples that agree with each other
+        try:
+            merged = consensus(samples)
+        except ValueError as e:
+            print(f"Failed to learn command: {command_name} ({e})")
             return False
+        
+        if len(merged.kept) < len(samples):
+            print(f"Dropped {len(samples) - len(merged.kept)} outlier sample(s)")
+        decoded = ir_decode.decode(merged.pulses)
+        self.learned_codes[command_name] = {
+            'pulses': merged.pulses,
+            'variance': merged.variance,
+            'samples': len(merged.kept),
+            'learned_at': datetime.now().isoformat(),
+            'protocol': decoded.protocol if decoded else "unknown",
+            'address': decoded.address if decoded else None,
+            'command': decoded.command if decoded else None
+        }
+        self.index = None
+        print(f"Successfully learned command: {command_name}")
+        return True
     
     def detect_protocol(self, pulses):
-        """Simple protocol detection based on pulse patterns"""
+        """Protocol name from a bit-level decode of the pulse train"""
         if not pulses:
             return "unknown"
         
-        # Check for common IR protocols based on timing
-        header = pulses[0] if len(pulses) > 0 else 0
-        
-        if 8000 < header < 10000:  # ~9ms header
-            return "NEC"
-        elif 2000 < header < 3000:  # ~2.4ms header
-            return "Sony"
-        elif 3000 < header < 4000:  # ~3.6ms header
-            return "RC5"
-        else:
-            return "unknown"
+        decoded = ir_decode.decode(pulses)
+        return decoded.protocol if decoded else "unknown"
     
-    def save_learned_codes(self, filename="learned_ir_codes.json"):
+    def save_learned_codes(self, filename=CODES_FILE):
         """Save learned codes to file"""
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.learned_codes, f, indent=2)
-            print(f"Saved learned codes to {filename}")
+            # New codes are appended to the store as they are learned,
+            # saving only has to flush (and now and then compact) it
+            if not isinstance(self.learned_codes, IRCodeStore):
+                store = IRCodeStore(filename)
+                store.update(self.learned_codes)
+                self.learned_codes = store
+            self.learned_codes.sync()
+            print(f"Saved learned codes to {self.learned_codes.filename}")
         except Exception as e:
             print(f"Error saving codes: {e}")
     
-    def load_learned_codes(self, filename="learned_ir_codes.json"):
+    def load_learned_codes(self, filename=CODES_FILE):
         """Load previously learned codes"""
         try:
-            with open(filename, 'r') as f:
-                self.learned_codes = json.load(f)
-            print(f"Loaded {len(self.learned_codes)} learned codes")
-        except FileNotFoundError:
-            print("No previous codes found")
+            self.learned_codes = IRCodeStore(filename)
+            self.index = None
+            if not self.learned_codes and os.path.exists(LEGACY_CODES_FILE):
+                count = self.learned_codes.import_json(LEGACY_CODES_FILE)
+                print(f"Imported {count} codes from {LEGACY_CODES_FILE}")
+            if self.learned_codes:
+                print(f"Loaded {len(self.learned_codes)} learned codes")
+            else:
+                print("No previous codes found")
         except Exception as e:
             print(f"Error loading codes: {e}")
     
+    def recognize(self, pulses):
+        """Name of the learned command matching a captured signal, or None"""
+        if self.index is None:
+            self.index = CodeIndex(self.learned_codes)
+        return self.index.match(pulses)
+    
+    def listen(self):
+        """Recognize incoming signals until Ctrl+C"""
+        if not self.learned_codes:
+            print("No commands learned yet")
+            return
+        if self.index is None:
+            self.index = CodeIndex(self.learned_codes)
+        
+        # NEC frames are decoded edge by edge in the GPIO callback and
+        # arrive here as soon as their last bit is in
+        frames = queue.SimpleQueue()
+        decoder = StreamDecoder(lambda decoded, at: frames.put((decoded, at)))
+        idle_gap = self.edge_capture.idle_gap_ns / 1e9
+        
+        print("\nListening for learned commands. Press Ctrl+C to stop...")
+        self.edge_capture.start(decoder.feed)
+        try:
+            while True:
+                try:
+                    decoded, at = frames.get(timeout=idle_gap)
+                except queue.Empty:
+                    # Anything the stream decoder does not handle
+                    pulses = decoder.take_unhandled()
+                    if pulses:
+                        command = self.recognize(pulses)
+                        if command:
+                            print(f"Received: {command}")
+                        else:
+                            print(f"Unknown signal ({len(pulses)} pulses)")
+                    continue
+                
+                command = self.index.lookup(decoded)
+                latency_ms = (time.perf_counter_ns() - at) / 1e6
+                repeat = " (repeat)" if decoded.repeat else ""
+                if command:
+                    print(f"Received: {command}{repeat} [{latency_ms:.2f} ms after last bit]")
+                else:
+                    print(f"Unknown {decoded.protocol} code: address 0x{decoded.address:X} "
+                          f"command 0x{decoded.command:X}{repeat}")
+        except KeyboardInterrupt:
+            print("\nStopped listening")
+        finally:
+            self.edge_capture.stop()
+    
+    def send_command(self, command_name, repeat=1):
+        """Replay a learned command through the IR LED"""
+        if command_name not in self.learned_codes:
+            print(f"Unknown command: {command_name}")
+            return False
+        if self.tx_pin is None:
+            print("No transmitter pin configured")
+            return False
+        
+        try:
+            if self.transmitter is None:
+                self.transmitter = IRTransmitter(PigpioBackend(self.tx_pin))
+            self.transmitter.send(command_name, self.learned_codes[command_name]['pulses'], repeat)
+            print(f"Sent command: {command_name}")
+            return True
+        except Exception as e:
+            print(f"Error sending command: {e}")
+            return False
+    
     def list_learned_commands(self):
         """Display all learned commands"""
         if not self.learned_codes:
@@ -121,14 +225,21 @@ class IRLearner:
             protocol = data.get('protocol', 'unknown')
             learned_at = data.get('learned_at', 'unknown')
             pulse_count = len(data.get('pulses', []))
-            print(f"  {cmd}: {protocol} protocol, {pulse_count} pulses, learned: {learned_at}")
+            code = ""
+            if data.get('command') is not None:
+                code = f" address 0x{data['address']:X} command 0x{data['command']:X},"
+            print(f"  {cmd}: {protocol} protocol,{code} {pulse_count} pulses, learned: {learned_at}")
     
     def cleanup(self):
         """Clean up GPIO"""
+        if self.transmitter:
+            self.transmitter.close()
+        if isinstance(self.learned_codes, IRCodeStore):
+            self.learned_codes.close()
         GPIO.cleanup()
 
 def main():
-    ir_learner = IRLearner(ir_pin=18)  # Change pin as needed
+    ir_learner = IRLearner(ir_pin=18, tx_pin=17)  # Change pins as needed
     
     try:
         ir_learner.load_learned_codes()
@@ -137,10 +248,12 @@ def main():
             print("\n=== IR Learning Menu ===")
             print("1. Learn new command")
             print("2. List learned commands")
-            print("3. Save codes to file")
-            print("4. Exit")
+            print("3. Listen for learned commands")
+            print("4. Send learned command")
+            print("5. Save codes to file")
+            print("6. Exit")
             
-            choice = input("Enter choice (1-4): ").strip()
+            choice = input("Enter choice (1-6): ").strip()
             
             if choice == "1":
                 command_name = input("Enter command name: ").strip()
@@ -153,9 +266,16 @@ def main():
                 ir_learner.list_learned_commands()
             
             elif choice == "3":
-                ir_learner.save_learned_codes()
+                ir_learner.listen()
             
             elif choice == "4":
+                command_name = input("Enter command name: ").strip()
+                ir_learner.send_command(command_name)
+            
+            elif choice == "5":
+                ir_learner.save_learned_codes()
+            
+            elif choice == "6":
                 break
             
             else:
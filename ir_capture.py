@@ -0,0 +1,71 @@
+"""
+Edge-interrupt IR capture
+Timestamps every transition on the receiver pin from a GPIO edge callback
+instead of busy-polling GPIO.input, so capturing costs almost no CPU and
+pulse widths are not quantized by the polling loop.
+"""
+
+import time
+import threading
+from array import array
+
+import RPi.GPIO as GPIO
+
+MAX_EDGES = 512          # enough for NEC/Sony/RC5 frames plus repeats
+IDLE_GAP_US = 20000      # frame is over after this long without an edge
+
+
+class EdgeCapture:
+    def __init__(self, pin, max_edges=MAX_EDGES, idle_gap_us=IDLE_GAP_US):
+        self.pin = pin
+        self.idle_gap_ns = idle_gap_us * 1000
+        # Preallocated so the callback never allocates
+        self.timestamps = array('q', bytes(8 * max_edges))
+        self.count = 0
+        self._first_edge = threading.Event()
+
+    def _on_edge(self, channel):
+        """GPIO callback - store the edge time and return as fast as possible"""
+        now = time.perf_counter_ns()
+        n = self.count
+        if n < len(self.timestamps):
+            self.timestamps[n] = now
+            self.count = n + 1
+            if n == 0:
+                self._first_edge.set()
+
+    def capture(self, timeout=10):
+        """Capture one frame, returns pulse widths in microseconds or None"""
+        self.count = 0
+        self._first_edge.clear()
+        GPIO.add_event_detect(self.pin, GPIO.BOTH, callback=self._on_edge)
+        try:
+            if not self._first_edge.wait(timeout):
+                print("Timeout waiting for signal")
+                return None
+
+            # Sleep until the line has been idle for idle_gap_ns
+            deadline = time.perf_counter_ns() + int(timeout * 1e9)
+            while self.count < len(self.timestamps):
+                now = time.perf_counter_ns()
+                idle = now - self.timestamps[self.count - 1]
+                if idle >= self.idle_gap_ns or now >= deadline:
+                    break
+                time.sleep((self.idle_gap_ns - idle) / 1e9)
+        finally:
+            GPIO.remove_event_detect(self.pin)
+
+        return self.pulses()
+
+    def start(self, listener):
+        """Stream edge timestamps to listener(timestamp_ns) until stop()"""
+        GPIO.add_event_detect(self.pin, GPIO.BOTH,
+                              callback=lambda channel: listener(time.perf_counter_ns()))
+
+    def stop(self):
+        GPIO.remove_event_detect(self.pin)
+
+    def pulses(self):
+        """Widths between captured edges in microseconds"""
+        ts = self.timestamps
+        return [(ts[i + 1] - ts[i]) // 1000 for i in range(self.count - 1)]
@@ -0,0 +1,56 @@
+"""
+Multi-sample consensus for learned IR codes
+Aligns several captures of the same button, drops the ones whose length
+or timing is off, and merges the rest with a per-pulse median. The whole
+merge is a handful of array operations, so it costs the same for 3 or 30
+samples.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ir_decode import split_frames
+
+Consensus = namedtuple('Consensus', 'pulses variance kept')
+
+MAX_LENGTH_DIFF = 2      # pulses a sample may differ from the median length
+MAX_TIMING_DIFF = 0.25   # mean relative deviation from the median train
+
+
+def consensus(samples, max_length_diff=MAX_LENGTH_DIFF, max_timing_diff=MAX_TIMING_DIFF):
+    """
+    Merge captures into one pulse train.
+    Returns Consensus(pulses, variance, kept) where variance is per pulse
+    (us^2) and kept lists the indices of the samples that were used.
+    Raises ValueError saying why when there is no consensus: fewer than
+    two samples hold a frame at all (noise, nothing but gaps), or fewer
+    than two agree on length and timing.
+    """
+    # First frame of every sample that has one, by sample index
+    usable = [(i, frames[0]) for i, frames in enumerate(map(split_frames, samples)) if frames]
+    if len(usable) < 2:
+        raise ValueError(f"only {len(usable)} of {len(samples)} samples contain an IR frame")
+    indices = np.array([i for i, _ in usable])
+    frames = [frame for _, frame in usable]
+
+    # Length outliers - a missed or split edge shifts everything after it
+    lengths = np.array([len(frame) for frame in frames])
+    kept = np.flatnonzero(np.abs(lengths - np.median(lengths)) <= max_length_diff)
+    if len(kept) < 2:
+        raise ValueError(f"only {len(kept)} of {len(samples)} samples agree on the length")
+
+    n = int(lengths[kept].min())
+    block = np.vstack([frames[i][:n] for i in kept]).astype(np.float64)
+
+    # Timing outliers - mean relative distance to the per-pulse median
+    median = np.median(block, axis=0)
+    deviation = np.mean(np.abs(block - median) / np.maximum(median, 1.0), axis=1)
+    good = deviation <= max_timing_diff
+    if good.sum() < 2:
+        raise ValueError(f"only {good.sum()} of {len(samples)} samples agree on the timing")
+
+    block = block[good]
+    pulses = np.rint(np.median(block, axis=0)).astype(int).tolist()
+    variance = np.round(block.var(axis=0), 1).tolist()
+    return Consensus(pulses, variance, indices[kept[good]].tolist())
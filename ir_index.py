@@ -0,0 +1,129 @@
+"""
+Fingerprint index over learned IR codes
+Every code gets a compact fingerprint - the decoded (protocol, address,
+command) when the frame decodes, otherwise its widths quantized to bytes -
+kept in a dict for O(1) lookup. A frame that decodes matches only on its
+fingerprint. A frame that does not decode falls back to a nearest-neighbour
+search over all codes of the same length, done as one NumPy distance
+computation per length bucket.
+
+  python ir_index.py check
+"""
+
+import sys
+
+import numpy as np
+
+import ir_decode
+
+QUANTUM_US = 250        # raw fingerprint resolution
+MATCH_DISTANCE = ir_decode.TOLERANCE    # max relative error of any width for a fuzzy match
+
+
+def fingerprint(frame, decoded=None):
+    """Hashable fingerprint of one frame"""
+    if decoded is None:
+        decoded = ir_decode.decode(frame)
+    if decoded is not None and decoded.command is not None:
+        return (decoded.protocol, decoded.address, decoded.command)
+    quantized = np.clip(np.rint(np.asarray(frame) / QUANTUM_US), 1, 255)
+    return quantized.astype(np.uint8).tobytes()
+
+
+class CodeIndex:
+    def __init__(self, learned_codes=None):
+        self.exact = {}
+        self._buckets = {}     # length -> (names, 2D pulse array)
+        self._pending = {}     # length -> [(name, frame)] not yet stacked
+        for name, data in (learned_codes or {}).items():
+            self.add(name, data['pulses'])
+        # Stack now so the first lookup does not pay for it
+        for length in list(self._pending):
+            self._bucket(length)
+
+    def add(self, name, pulses):
+        """Index one learned code"""
+        frames = ir_decode.split_frames(pulses)
+        if not frames:
+            return
+        frame = frames[0]
+        self.exact[fingerprint(frame)] = name
+        self._pending.setdefault(len(frame), []).append((name, frame))
+
+    def _bucket(self, length):
+        """Names and stacked pulses of every code with this many widths"""
+        pending = self._pending.pop(length, None)
+        if pending:
+            names, block = self._buckets.get(length, ([], np.empty((0, length))))
+            names = names + [name for name, _ in pending]
+            block = np.vstack([block] + [frame for _, frame in pending]).astype(np.float64)
+            self._buckets[length] = (names, block)
+        return self._buckets.get(length)
+
+    def nearest(self, frame, max_distance=MATCH_DISTANCE):
+        """Closest code of the same length, or None if none is close enough"""
+        bucket = self._bucket(len(frame))
+        if bucket is None:
+            return None
+        names, block = bucket
+        # The worst width counts, so one wrong bit can't be averaged away
+        distance = np.max(np.abs(block - frame) / np.maximum(block, 1.0), axis=1)
+        best = int(np.argmin(distance))
+        return names[best] if distance[best] <= max_distance else None
+
+    def lookup(self, decoded):
+        """Command name for an already decoded frame, or None"""
+        return self.exact.get((decoded.protocol, decoded.address, decoded.command))
+
+    def match(self, pulses):
+        """Command name for a captured signal, or None"""
+        frames = ir_decode.split_frames(pulses)
+        if not frames:
+            return None
+        frame = frames[0].astype(np.float64)
+        decoded = ir_decode.decode(frame)
+        name = self.exact.get(fingerprint(frame, decoded))
+        # A clean decode is a different button if it isn't in the index
+        if name is None and (decoded is None or decoded.command is None):
+            name = self.nearest(frame)
+        return name
+
+
+def _nec(address, command):
+    pulses = [9000, 4500]
+    data = address | (address ^ 0xFF) << 8 | command << 16 | (command ^ 0xFF) << 24
+    for bit in range(32):
+        pulses += [562, 1687 if data >> bit & 1 else 562]
+    pulses.append(562)
+    return pulses
+
+
+def check():
+    """Exact, unknown and fuzzy matches on a small index"""
+    index = CodeIndex({"power": {"pulses": _nec(4, 0x08)}, "mute": {"pulses": _nec(4, 0x20)}})
+    assert index.match(_nec(4, 0x08)) == "power"
+    assert index.match(_nec(4, 0x20)) == "mute"
+    # Decodes cleanly but was never learned
+    for address, command in ((4, 0x09), (4, 0x55), (7, 0x99)):
+        assert index.match(_nec(address, command)) is None, (address, command)
+
+    # A frame the decoder rejects still finds a close raw code
+    raw = [3000, 1000, 500, 1500, 500, 500, 500, 1500, 500]
+    index.add("raw", raw)
+    assert index.match([width * 1.1 for width in raw]) == "raw"
+    flipped = list(raw)
+    flipped[3] = 500
+    assert index.match(flipped) is None
+    print("IR code index check passed")
+
+
+def main():
+    if len(sys.argv) == 2 and sys.argv[1] == "check":
+        check()
+        return
+    print("Usage: ir_index.py check")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
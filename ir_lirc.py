@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+LIRC remote database importer
+Reads lircd.conf files (raw_codes and protocol-coded SPACE_ENC, RC5 and
+RC6 remotes), turns every button into a pulse train, decodes it with
+ir_decode and appends it to the IR code store as "<remote>/<button>".
+Files are parsed and decoded in a process pool; only the store writes
+happen in the main process.
+
+  python ir_lirc.py import learned_ir_codes.irc /usr/share/lirc/remotes
+  python ir_lirc.py lookup learned_ir_codes.irc NEC 0x4 0x8
+  python ir_lirc.py check
+"""
+
+import os
+import sys
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import ir_decode
+from ir_store import IRCodeStore
+
+# Settings taking one or two numbers, everything else is ignored
+NUMERIC = {"bits", "pre_data_bits", "post_data_bits", "pre_data", "post_data",
+           "header", "one", "zero", "ptrail", "plead", "pre", "post", "rc6_mask"}
+
+
+def _number(text):
+    return int(text, 16) if text.lower().startswith("0x") else int(text)
+
+
+def parse_lirc(text):
+    """
+    Parse the text of a lircd.conf file.
+    Returns a list of remotes, each a dict of settings with the buttons
+    under "codes" (name -> code) or "raw_codes" (name -> pulse list).
+    """
+    remotes = []
+    remote = None
+    section = None
+    raw_name = None
+
+    for line in text.splitlines():
+        words = line.split("#", 1)[0].split()
+        if not words:
+            continue
+        key = words[0].lower()
+
+        if key == "begin" and len(words) > 1:
+            if words[1] == "remote":
+                remote = {"flags": set(), "codes": {}, "raw_codes": {}}
+            else:
+                section = words[1]
+                raw_name = None
+        elif key == "end" and len(words) > 1:
+            if words[1] == "remote" and remote is not None:
+                remotes.append(remote)
+                remote = None
+            section = None
+        elif remote is None:
+            continue
+        elif section == "codes":
+            try:
+                remote["codes"][words[0]] = _number(words[1])
+            except (IndexError, ValueError):
+                pass
+        elif section == "raw_codes":
+            if key == "name" and len(words) > 1:
+                raw_name = words[1]
+                remote["raw_codes"][raw_name] = []
+            elif raw_name is not None:
+                remote["raw_codes"][raw_name] += [int(w) for w in words if w.isdigit()]
+        elif key == "name" and len(words) > 1:
+            remote["name"] = words[1]
+        elif key == "flags" and len(words) > 1:
+            remote["flags"] = {flag.strip().upper() for flag in " ".join(words[1:]).split("|")}
+        elif key in NUMERIC and len(words) > 1:
+            try:
+                values = [_number(w) for w in words[1:3]]
+            except ValueError:
+                continue
+            remote[key] = values if len(values) > 1 else values[0]
+    return remotes
+
+
+def encode(remote, code):
+    """Pulse train (mark first) for one button of a protocol-coded remote"""
+    flags = remote["flags"]
+    biphase = "RC5" if flags & {"RC5", "SHIFT_ENC"} else "RC6" if "RC6" in flags else None
+    one = remote.get("one", [0, 0])
+    zero = remote.get("zero", [0, 0])
+    rc6_mask = remote.get("rc6_mask", 0)
+    levels = []
+
+    def add(level, width):
+        if width:
+            levels.append((level, width))
+
+    def add_bits(value, count, position):
+        order = range(count) if "REVERSE" in flags else range(count - 1, -1, -1)
+        for bit in order:
+            is_one = value >> bit & 1
+            mark, space = one if is_one else zero
+            if rc6_mask >> (position + bit) & 1:
+                mark, space = mark * 2, space * 2
+            # LIRC sends every biphase "1" space first, RC6 codes are
+            # stored complemented because of that
+            if biphase and is_one:
+                add(0, space)
+                add(1, mark)
+            else:
+                add(1, mark)
+                add(0, space)
+
+    bits = remote.get("bits", 0)
+    pre_bits = remote.get("pre_data_bits", 0)
+    post_bits = remote.get("post_data_bits", 0)
+
+    if isinstance(remote.get("header"), list):
+        add(1, remote["header"][0])
+        add(0, remote["header"][1])
+    add(1, remote.get("plead", 0))
+    add_bits(remote.get("pre_data", 0), pre_bits, bits + post_bits)
+    if isinstance(remote.get("pre"), list):
+        add(1, remote["pre"][0])
+        add(0, remote["pre"][1])
+    add_bits(code, bits, post_bits)
+    if isinstance(remote.get("post"), list):
+        add(1, remote["post"][0])
+        add(0, remote["post"][1])
+    add_bits(remote.get("post_data", 0), post_bits, 0)
+    add(1, remote.get("ptrail", 0))
+
+    # Merge runs of the same level, the train starts and ends on a mark
+    pulses = []
+    last_level = None
+    for level, width in levels:
+        if level == last_level:
+            pulses[-1] += width
+        elif pulses or level == 1:
+            pulses.append(width)
+            last_level = level
+    if len(pulses) % 2 == 0 and pulses:
+        pulses.pop()
+    return pulses
+
+
+def load_file(path):
+    """
+    Parse and decode one lircd.conf file (runs in a worker process).
+    Returns a list of (store name, code data) pairs.
+    """
+    try:
+        with open(path, "r", errors="replace") as f:
+            remotes = parse_lirc(f.read())
+    except OSError as e:
+        print(f"Error reading {path}: {e}")
+        return []
+
+    entries = []
+    for remote in remotes:
+        remote_name = remote.get("name", os.path.basename(path))
+        buttons = list(remote["raw_codes"].items())
+        if remote["codes"] and not remote["flags"] & {"RAW_CODES"}:
+            if remote["flags"] & {"SPACE_ENC", "RC5", "SHIFT_ENC", "RC6"} or not remote["flags"]:
+                buttons += [(button, encode(remote, code)) for button, code in remote["codes"].items()]
+        buttons = [(button, pulses) for button, pulses in buttons if len(pulses) > 2]
+
+        decoded = ir_decode.decode_many([pulses for _, pulses in buttons])
+        for (button, pulses), code in zip(buttons, decoded):
+            entries.append((f"{remote_name}/{button}", {
+                'pulses': pulses,
+                'learned_at': datetime.now().isoformat(),
+                'protocol': code.protocol if code else "unknown",
+                'address': code.address if code else None,
+                'command': code.command if code else None,
+                'source': path
+            }))
+    return entries
+
+
+def find_files(paths):
+    """lircd.conf files given directly or found under directories"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, name) for name in sorted(names)
+                          if name.endswith(".conf") or name.endswith(".lircd")]
+        else:
+            files.append(path)
+    return files
+
+
+def import_files(store, paths, workers=None):
+    """Import every file into the store in parallel, returns the code count"""
+    files = find_files(paths)
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for entries in pool.map(load_file, files, chunksize=max(1, len(files) // 64)):
+            for name, data in entries:
+                store[name] = data
+            count += len(entries)
+    store.sync()
+    return count
+
+
+def build_index(store):
+    """(protocol, address, command) -> [names], from metadata only"""
+    index = {}
+    for name in store:
+        meta = store.meta(name)
+        if meta.get('command') is not None:
+            key = (meta['protocol'], meta['address'], meta['command'])
+            index.setdefault(key, []).append(name)
+    return index
+
+
+CHECK_CONF = """
+begin remote
+  name  mceusb
+  bits           16
+  flags RC6|CONST_LENGTH
+  header       2667   889
+  one           444   444
+  zero          444   444
+  pre_data_bits   21
+  pre_data       0x37FF0
+  gap          105000
+  toggle_bit_mask 0x8000
+  rc6_mask    0x100000000
+      begin codes
+          Power                    0x00007BF3
+          Mute                     0x00007BF1
+          Home                     0x00007BDD
+      end codes
+end remote
+
+begin remote
+  name  rc5-tv
+  bits           13
+  flags RC5|CONST_LENGTH
+  one            889   889
+  zero           889   889
+  plead          889
+  gap          113792
+  toggle_bit_mask 0x800
+      begin codes
+          Power                    0x100C
+          Mute                     0x100D
+      end codes
+end remote
+
+begin remote
+  name  nec-tv
+  bits           16
+  flags SPACE_ENC|CONST_LENGTH
+  header       9000  4500
+  one           560  1690
+  zero          560   560
+  ptrail        560
+  pre_data_bits   16
+  pre_data       0x04FB
+  gap          108000
+      begin codes
+          Power                    0x08F7
+      end codes
+end remote
+"""
+
+# (protocol, address, command) each CHECK_CONF button has to decode to
+CHECK_EXPECTED = {
+    "mceusb/Power": ("RC6-6", 0x800F84, 0x0C),
+    "mceusb/Mute": ("RC6-6", 0x800F84, 0x0E),
+    "mceusb/Home": ("RC6-6", 0x800F84, 0x22),
+    "rc5-tv/Power": ("RC5", 0, 12),
+    "rc5-tv/Mute": ("RC5", 0, 13),
+    "nec-tv/Power": ("NEC", 0x20, 0x10),
+}
+
+
+def check():
+    """Import a small lircd.conf with RC6 (mceusb), RC5 and NEC remotes"""
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), "check.lircd.conf")
+    with open(path, "w") as f:
+        f.write(CHECK_CONF)
+    decoded = {name: (data["protocol"], data["address"], data["command"])
+               for name, data in load_file(path)}
+    for name, expected in CHECK_EXPECTED.items():
+        assert decoded.get(name) == expected, f"{name}: {decoded.get(name)} != {expected}"
+    print(f"LIRC import check passed ({len(decoded)} codes)")
+
+
+def main():
+    if len(sys.argv) == 2 and sys.argv[1] == "check":
+        check()
+    elif len(sys.argv) >= 4 and sys.argv[1] == "import":
+        store = IRCodeStore(sys.argv[2])
+        start = datetime.now()
+        count = import_files(store, sys.argv[3:])
+        elapsed = (datetime.now() - start).total_seconds()
+        print(f"Imported {count} codes in {elapsed:.1f}s, store holds {len(store)}")
+        store.close()
+    elif len(sys.argv) == 6 and sys.argv[1] == "lookup":
+        store = IRCodeStore(sys.argv[2])
+        index = build_index(store)
+        key = (sys.argv[3], int(sys.argv[4], 0), int(sys.argv[5], 0))
+        names = index.get(key, [])
+        for name in names:
+            print(name)
+        if not names:
+            print("No matching codes")
+        store.close()
+    else:
+        print("Usage: ir_lirc.py import <codes.irc> <lircd.conf or directory>...")
+        print("       ir_lirc.py lookup <codes.irc> <protocol> <address> <command>")
+        print("       ir_lirc.py check")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Multi-receiver IR capture service
+Watches several IR receiver pins at once. Every pin has its own edge
+callback, streaming decoder and bounded frame queue, so a full queue
+only drops that receiver's frames and the work per edge does not grow
+with the number of pins. RPi.GPIO runs every edge callback on one shared
+thread though, so a slow callback on one pin delays the edges of all the
+others. Per-receiver frame, edge and dropped-frame counters are kept for
+monitoring.
+
+  python ir_multi.py 18 23 24
+"""
+
+import sys
+import time
+import queue
+import threading
+
+import RPi.GPIO as GPIO
+
+import ir_decode
+from ir_capture import IDLE_GAP_US
+from ir_stream import StreamDecoder
+
+QUEUE_SIZE = 64   # decoded frames waiting per receiver before dropping
+
+
+class Receiver:
+    def __init__(self, pin, queue_size=QUEUE_SIZE):
+        self.pin = pin
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.decoder = StreamDecoder(self._on_frame)
+        self.edges = 0
+        self.frame_count = 0
+        self.dropped = 0
+        self.started_at = time.monotonic()
+        # Frames come from the edge callback and from the flusher thread
+        self._lock = threading.Lock()
+
+    def on_edge(self, channel):
+        """GPIO callback for this pin"""
+        self.edges += 1
+        self.decoder.feed(time.perf_counter_ns())
+
+    def _on_frame(self, decoded, timestamp_ns):
+        with self._lock:
+            try:
+                self.frames.put_nowait((decoded, timestamp_ns))
+                self.frame_count += 1
+            except queue.Full:
+                self.dropped += 1
+
+    def flush_idle(self):
+        """Decode a finished frame the stream decoder could not handle"""
+        pulses = self.decoder.take_unhandled()
+        if pulses:
+            decoded = ir_decode.decode(pulses)
+            # A lone NEC repeat carries no code to report
+            if decoded and decoded.command is not None:
+                self._on_frame(decoded, self.decoder.last_edge)
+
+    def stats(self):
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        with self._lock:
+            frames, dropped = self.frame_count, self.dropped
+        return {
+            'edges': self.edges,
+            'frames': frames,
+            'dropped': dropped,
+            'queued': self.frames.qsize(),
+            'frames_per_sec': frames / elapsed,
+        }
+
+
+class MultiReceiver:
+    def __init__(self, pins, queue_size=QUEUE_SIZE):
+        GPIO.setmode(GPIO.BCM)
+        self.receivers = {pin: Receiver(pin, queue_size) for pin in pins}
+        self._running = False
+        self._flusher = None
+
+    def start(self):
+        for pin, receiver in self.receivers.items():
+            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(pin, GPIO.BOTH, callback=receiver.on_edge)
+        self._running = True
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        # Only non-NEC frames need this, they end on an idle gap
+        while self._running:
+            time.sleep(IDLE_GAP_US / 1e6)
+            for receiver in self.receivers.values():
+                receiver.flush_idle()
+
+    def stop(self):
+        self._running = False
+        for pin in self.receivers:
+            GPIO.remove_event_detect(pin)
+        if self._flusher:
+            self._flusher.join()
+
+    def queue(self, pin):
+        """Decoded (frame, timestamp_ns) queue of one receiver"""
+        return self.receivers[pin].frames
+
+    def stats(self):
+        return {pin: receiver.stats() for pin, receiver in self.receivers.items()}
+
+
+def main():
+    pins = [int(arg) for arg in sys.argv[1:]] or [18]
+    service = MultiReceiver(pins)
+
+    def consume(pin):
+        frames = service.queue(pin)
+        while True:
+            decoded, at = frames.get()
+            latency_ms = (time.perf_counter_ns() - at) / 1e6
+            print(f"[GPIO{pin}] {decoded.protocol} address 0x{decoded.address:X} "
+                  f"command 0x{decoded.command:X}{' (repeat)' if decoded.repeat else ''} "
+                  f"[{latency_ms:.2f} ms]")
+
+    try:
+        service.start()
+        for pin in pins:
+            threading.Thread(target=consume, args=(pin,), daemon=True).start()
+
+        print(f"Listening on GPIO {', '.join(str(pin) for pin in pins)}")
+        print("Press Ctrl+C to exit\n")
+        while True:
+            time.sleep(10)
+            for pin, stats in service.stats().items():
+                print(f"GPIO{pin}: {stats['frames']} frames ({stats['frames_per_sec']:.2f}/s), "
+                      f"{stats['edges']} edges, {stats['dropped']} dropped")
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        service.stop()
+        GPIO.cleanup()
+
+
+if __name__ == "__main__":
+    main()
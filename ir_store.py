@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Binary store for learned IR codes
+Append-only file of records, each a small fixed header, the command name,
+its metadata as JSON and the pulse widths packed as uint16 (or uint32 when
+a width does not fit). Opening the store only walks the record headers
+through mmap to build the name index; pulses are read per command when
+asked for. Overwrites and deletes append a new record, compact() rewrites
+the file with just the live ones.
+
+  python ir_store.py import learned_ir_codes.json learned_ir_codes.irc
+  python ir_store.py export learned_ir_codes.irc learned_ir_codes.json
+  python ir_store.py check
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+from collections.abc import MutableMapping
+
+import numpy as np
+
+MAGIC = b"IRC1"
+FILE_HEADER = struct.Struct("<4sHH")      # magic, version, flags
+RECORD = struct.Struct("<IBBHII")         # length, kind, width, name, meta, count
+PUT = 1
+DELETE = 2
+DTYPES = {2: np.dtype("<u2"), 4: np.dtype("<u4")}
+
+COMPACT_MIN_BYTES = 64 * 1024   # don't bother compacting tiny files
+
+
+class IRCodeStore(MutableMapping):
+    def __init__(self, filename):
+        self.filename = filename
+        self._index = {}          # name -> (record offset, width, name len, meta len, count)
+        self._dead_bytes = 0
+        self._map = None
+        self._open()
+
+    def _open(self):
+        if not os.path.exists(self.filename):
+            with open(self.filename, "wb") as f:
+                f.write(FILE_HEADER.pack(MAGIC, 1, 0))
+        self._file = open(self.filename, "r+b")
+        magic, version, _ = FILE_HEADER.unpack(self._file.read(FILE_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{self.filename} is not an IR code store")
+        self._remap()
+        end = self._scan()
+        if end < len(self._map):
+            # Cut off a torn write so appends don't land behind it
+            self._map.close()
+            self._map = None
+            self._file.truncate(end)
+            self._remap()
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+    def _scan(self):
+        """Build the name index from record headers, returns where the last good record ends"""
+        mm = self._map
+        offset = FILE_HEADER.size
+        while offset + RECORD.size <= len(mm):
+            length, kind, width, name_len, meta_len, count = RECORD.unpack_from(mm, offset)
+            if length < RECORD.size + name_len or offset + length > len(mm):
+                break     # torn write at the tail
+            start = offset + RECORD.size
+            name = mm[start:start + name_len].decode("utf-8")
+            if name in self._index:
+                self._dead_bytes += self._record_size(name)
+            if kind == PUT:
+                self._index[name] = (offset, width, name_len, meta_len, count)
+            elif kind == DELETE:
+                self._index.pop(name, None)
+                self._dead_bytes += length
+            offset += length
+        return offset
+
+    def _record_size(self, name):
+        _, width, name_len, meta_len, count = self._index[name]
+        return RECORD.size + name_len + meta_len + width * count
+
+    def _read(self, name):
+        offset, width, name_len, meta_len, count = self._index[name]
+        if offset + self._record_size(name) > len(self._map):
+            self._remap()
+        start = offset + RECORD.size + name_len
+        meta = json.loads(self._map[start:start + meta_len])
+        start += meta_len
+        pulses = np.frombuffer(self._map, DTYPES[width], count, start).copy()
+        return meta, pulses
+
+    def meta(self, name):
+        """Metadata of one command without touching its pulses"""
+        offset, width, name_len, meta_len, count = self._index[name]
+        if offset + self._record_size(name) > len(self._map):
+            self._remap()
+        start = offset + RECORD.size + name_len
+        meta = json.loads(self._map[start:start + meta_len])
+        meta.pop("pulses", None)
+        return meta
+
+    def pulses(self, name):
+        """Pulse widths of one command as a NumPy array"""
+        return self._read(name)[1]
+
+    def __getitem__(self, name):
+        meta, pulses = self._read(name)
+        meta["pulses"] = pulses.tolist()
+        return meta
+
+    @staticmethod
+    def _pack(name, data):
+        pulses = np.asarray(data.get("pulses", []))
+        if pulses.size and (pulses.dtype.kind not in "iu" or pulses.min() < 0 or pulses.max() >= 2 ** 32):
+            raise ValueError(f"{name}: pulses must be integers in 0..2^32")
+        width = 2 if not pulses.size or pulses.max() < 2 ** 16 else 4
+        name_bytes = name.encode("utf-8")
+        # Keep a placeholder so JSON export restores the original key order
+        meta = {key: None if key == "pulses" else value for key, value in data.items()}
+        meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        payload = pulses.astype(DTYPES[width]).tobytes()
+        length = RECORD.size + len(name_bytes) + len(meta_bytes) + len(payload)
+        header = RECORD.pack(length, PUT, width, len(name_bytes), len(meta_bytes), pulses.size)
+        return header + name_bytes + meta_bytes + payload, (width, len(name_bytes), len(meta_bytes), pulses.size)
+
+    def _append(self, record):
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(record)
+        self._file.flush()
+        return offset
+
+    def __setitem__(self, name, data):
+        record, layout = self._pack(name, data)
+        offset = self._append(record)
+        if name in self._index:
+            self._dead_bytes += self._record_size(name)
+        self._index[name] = (offset,) + layout
+
+    def __delitem__(self, name):
+        if name not in self._index:
+            raise KeyError(name)
+        name_bytes = name.encode("utf-8")
+        length = RECORD.size + len(name_bytes)
+        self._append(RECORD.pack(length, DELETE, 2, len(name_bytes), 0, 0) + name_bytes)
+        self._dead_bytes += self._record_size(name) + length
+        del self._index[name]
+
+    def __iter__(self):
+        return iter(list(self._index))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def compact(self):
+        """Rewrite the file with only the live records"""
+        temp = self.filename + ".tmp"
+        self._remap()
+        with open(temp, "wb") as out:
+            out.write(FILE_HEADER.pack(MAGIC, 1, 0))
+            for name in self._index:
+                offset = self._index[name][0]
+                out.write(self._map[offset:offset + self._record_size(name)])
+            out.flush()
+            os.fsync(out.fileno())
+        self.close()
+        os.replace(temp, self.filename)
+        self._index = {}
+        self._dead_bytes = 0
+        self._open()
+
+    def sync(self):
+        """Flush to disk, compacting once more than half the file is dead"""
+        size = os.fstat(self._file.fileno()).st_size
+        if self._dead_bytes > COMPACT_MIN_BYTES and self._dead_bytes * 2 > size:
+            self.compact()
+        else:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def import_json(self, filename):
+        """Add every code from a learned_ir_codes.json file"""
+        with open(filename, "r") as f:
+            codes = json.load(f)
+        for name, data in codes.items():
+            self[name] = data
+        return len(codes)
+
+    def export_json(self, filename):
+        """Write all codes in the learned_ir_codes.json layout"""
+        codes = {}
+        for name in self:
+            codes[name] = self[name]
+        with open(filename, "w") as f:
+            json.dump(codes, f, indent=2)
+        return len(codes)
+
+
+def check():
+    """Round trip, overwrite, delete and torn-tail recovery in a temp file"""
+    import tempfile
+    filename = os.path.join(tempfile.mkdtemp(), "check.irc")
+    store = IRCodeStore(filename)
+    store["power"] = {"protocol": "NEC", "pulses": [9000, 4500, 560, 1690, 560]}
+    store["long"] = {"pulses": [70000, 300]}
+    store["power"] = {"protocol": "NEC", "pulses": [9000, 4500, 560]}
+    store["gone"] = {"pulses": [1, 2]}
+    del store["gone"]
+    store.close()
+
+    # A crash in the middle of an append leaves part of a record behind
+    record, _ = IRCodeStore._pack("torn", {"pulses": list(range(100))})
+    with open(filename, "ab") as f:
+        f.write(record[:len(record) // 2])
+    store = IRCodeStore(filename)
+    assert "torn" not in store
+    store["after"] = {"pulses": [560, 560]}
+    store.close()
+
+    store = IRCodeStore(filename)
+    assert sorted(store) == ["after", "long", "power"], sorted(store)
+    assert store["power"]["pulses"] == [9000, 4500, 560]
+    assert store["long"]["pulses"] == [70000, 300]
+    assert store["after"]["pulses"] == [560, 560]
+    store.close()
+    print("IR code store check passed")
+
+
+def main():
+    if len(sys.argv) == 2 and sys.argv[1] == "check":
+        check()
+        return
+    if len(sys.argv) != 4 or sys.argv[1] not in ("import", "export"):
+        print("Usage: ir_store.py import <codes.json> <codes.irc>")
+        print("       ir_store.py export <codes.irc> <codes.json>")
+        print("       ir_store.py check")
+        sys.exit(1)
+
+    command, source, target = sys.argv[1:]
+    if command == "import":
+        store = IRCodeStore(target)
+        count = store.import_json(source)
+    else:
+        store = IRCodeStore(source)
+        count = store.export_json(target)
+    store.sync()
+    store.close()
+    print(f"{command.capitalize()}ed {count} codes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Streaming IR decoder
+State machine fed one edge timestamp at a time straight from the GPIO
+callback. NEC and extended NEC frames are emitted the moment the edge
+ending the last data bit arrives, NEC repeat frames as soon as their
+short header is seen - no waiting for the line to go idle and no whole
+capture to buffer. Frames in other protocols are kept in a small fixed
+buffer and handed back by take_unhandled() once the line goes idle, for
+ir_decode to deal with.
+"""
+
+import time
+import threading
+from array import array
+
+from ir_decode import Decoded, TOLERANCE, SLACK_US, FRAME_GAP_US, NEC_UNIT
+from ir_capture import MAX_EDGES, IDLE_GAP_US
+
+REPEAT_WINDOW_NS = 150_000_000   # NEC repeats come every 108 ms while held
+
+# States
+IDLE, HEADER_MARK, HEADER_SPACE, BIT_MARK, BIT_SPACE, REPEAT_MARK, DONE = range(7)
+
+
+def _near(width, target):
+    return abs(width - target) <= target * TOLERANCE + SLACK_US
+
+
+class StreamDecoder:
+    def __init__(self, on_frame, max_widths=MAX_EDGES):
+        """on_frame(decoded, timestamp_ns) is called from the edge callback"""
+        self.on_frame = on_frame
+        self.widths = array('l', bytes(array('l').itemsize * max_widths))
+        self.count = 0
+        self.state = IDLE
+        self.bits = 0
+        self.bit_count = 0
+        self.last_edge = None
+        self.marking = False      # line is inside a mark after the last edge
+        self.handled = False
+        self.last_decoded = None
+        self.last_decoded_at = 0
+        self._lock = threading.Lock()   # take_unhandled runs on another thread
+
+    def feed(self, timestamp_ns):
+        """Process one edge"""
+        with self._lock:
+            self._step(timestamp_ns)
+
+    def _step(self, timestamp_ns):
+        last = self.last_edge
+        self.last_edge = timestamp_ns
+        width = (timestamp_ns - last) // 1000 if last is not None else None
+        if width is None or width > IDLE_GAP_US or width > FRAME_GAP_US and not self.marking:
+            # The line was idle, so this edge starts the first mark of a frame
+            self.count = 0
+            self.handled = False
+            self.marking = True
+            self.state = HEADER_MARK
+            return
+        self.marking = not self.marking
+
+        if self.count < len(self.widths):
+            self.widths[self.count] = width
+            self.count += 1
+
+        state = self.state
+        if state == HEADER_MARK:
+            self.state = HEADER_SPACE if _near(width, 9000) else IDLE
+        elif state == HEADER_SPACE:
+            if _near(width, 4500):
+                self.bits = 0
+                self.bit_count = 0
+                self.state = BIT_MARK
+            elif _near(width, 2250):
+                self.state = REPEAT_MARK
+            else:
+                self.state = IDLE
+        elif state == BIT_MARK:
+            self.state = BIT_SPACE if _near(width, NEC_UNIT) else IDLE
+        elif state == BIT_SPACE:
+            if _near(width, 3 * NEC_UNIT):
+                self.bits |= 1 << self.bit_count
+            elif not _near(width, NEC_UNIT):
+                self.state = IDLE
+                return
+            self.bit_count += 1
+            if self.bit_count == 32:
+                self._emit_nec(timestamp_ns)
+                self.state = DONE
+            else:
+                self.state = BIT_MARK
+        elif state == REPEAT_MARK:
+            self.state = DONE
+            if self.last_decoded and timestamp_ns - self.last_decoded_at < REPEAT_WINDOW_NS:
+                self.handled = True
+                self.last_decoded_at = timestamp_ns
+                last = self.last_decoded
+                self.on_frame(Decoded(last.protocol, last.address, last.command, True), timestamp_ns)
+
+    def _emit_nec(self, timestamp_ns):
+        data = self.bits
+        address, address_inv = data & 0xFF, data >> 8 & 0xFF
+        command, command_inv = data >> 16 & 0xFF, data >> 24 & 0xFF
+        if command ^ command_inv != 0xFF:
+            return
+        if address ^ address_inv == 0xFF:
+            decoded = Decoded("NEC", address, command, False)
+        else:
+            decoded = Decoded("NECext", data & 0xFFFF, command, False)
+        self.handled = True
+        self.last_decoded = decoded
+        self.last_decoded_at = timestamp_ns
+        self.on_frame(decoded, timestamp_ns)
+
+    def take_unhandled(self, now_ns=None):
+        """
+        Widths of a frame the state machine could not decode, once the
+        line has been idle for IDLE_GAP_US, else None
+        """
+        if now_ns is None:
+            now_ns = time.perf_counter_ns()
+        with self._lock:
+            if self.handled or self.count < 2 or now_ns - self.last_edge < IDLE_GAP_US * 1000:
+                return None
+            self.handled = True
+            return self.widths[:self.count].tolist()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+IR transmit / replay of learned codes
+A stored pulse train is turned once into a carrier-modulated waveform -
+(level, microseconds) steps with every carrier edge placed on an absolute
+time grid, so rounding never accumulates - and cached per command. Playing
+it is left to a backend with hardware timing:
+
+  PigpioBackend     DMA-timed pigpio waves (needs the pigpiod daemon)
+  RecordingBackend  stand-in that records the edges it would emit, for
+                    testing timing without hardware
+
+  python ir_transmit.py    # timing check with the recording backend
+"""
+
+import time
+
+import numpy as np
+
+from ir_decode import match_header
+
+CARRIER_HZ = 38000
+DUTY_CYCLE = 0.33
+
+# Silence between repeated frames, so a receiver sees repeats and not one
+# long frame; by header, REPEAT_GAP_US for everything else
+REPEAT_GAPS_US = {"NEC": 40000, "NEC repeat": 96000, "Sony": 45000}
+REPEAT_GAP_US = 40000
+
+
+def build_waveform(pulses, carrier_hz=CARRIER_HZ, duty_cycle=DUTY_CYCLE):
+    """Carrier-modulated (level, duration_us) steps for a mark-first pulse train"""
+    period = 1e6 / carrier_hz
+    edges = []      # absolute (time_us, level)
+    start = 0
+    for i, width in enumerate(pulses):
+        if i % 2 == 0:
+            cycles = max(1, round(width / period))
+            for k in range(cycles):
+                edges.append((round(start + k * period), 1))
+                edges.append((round(start + (k + duty_cycle) * period), 0))
+        start += width
+    edges.append((round(start), 0))
+
+    steps = []
+    for (when, level), (next_when, _) in zip(edges, edges[1:]):
+        duration = next_when - when
+        if steps and steps[-1][0] == level:
+            steps[-1] = (level, steps[-1][1] + duration)
+        elif duration > 0:
+            steps.append((level, duration))
+    return steps
+
+
+def repeat_gap(pulses):
+    """Silence (us) to add after a frame before sending it again"""
+    if len(pulses) % 2 == 0:
+        return 0    # ends on a space, the captured trailing gap
+    return REPEAT_GAPS_US.get(match_header(np.asarray(pulses, dtype=np.float64)), REPEAT_GAP_US)
+
+
+def demodulate(edges, carrier_hz=CARRIER_HZ):
+    """
+    Mark/space widths a receiver would see from recorded (time_us, level)
+    edges: a mark lasts from its first carrier rise to one period after
+    its last rise.
+    """
+    period = 1e6 / carrier_hz
+    rises = [when for when, level in edges if level == 1]
+    if not rises:
+        return []
+    pulses = []
+    mark_start = last_rise = rises[0]
+    for when in rises[1:]:
+        if when - last_rise > 2 * period:
+            mark_end = last_rise + period
+            pulses += [mark_end - mark_start, when - mark_end]
+            mark_start = when
+        last_rise = when
+    pulses.append(last_rise + period - mark_start)
+    return [round(width) for width in pulses]
+
+
+class RecordingBackend:
+    """Stand-in transmitter, records every edge with ideal hardware timing"""
+
+    def __init__(self):
+        self.edges = []
+        self.end = 0        # us, where the last waveform finished
+
+    def prepare(self, steps):
+        return steps
+
+    def play(self, handle):
+        when = self.end
+        for level, duration in handle:
+            self.edges.append((when, level))
+            when += duration
+        self.end = when
+
+    def release(self, handle):
+        pass
+
+    def close(self):
+        pass
+
+
+class PigpioBackend:
+    """DMA-timed output through pigpio waves"""
+
+    def __init__(self, pin):
+        import pigpio   # optional, only needed on the Pi doing the sending
+        self.pigpio = pigpio
+        self.pin = pin
+        self.pi = pigpio.pi()
+        if not self.pi.connected:
+            raise RuntimeError("Cannot connect to pigpiod, start it with 'sudo pigpiod'")
+        self.pi.set_mode(pin, pigpio.OUTPUT)
+
+    def prepare(self, steps):
+        mask = 1 << self.pin
+        self.pi.wave_add_generic([
+            self.pigpio.pulse(mask, 0, duration) if level else self.pigpio.pulse(0, mask, duration)
+            for level, duration in steps
+        ])
+        return self.pi.wave_create()
+
+    def play(self, handle):
+        self.pi.wave_send_once(handle)
+        while self.pi.wave_tx_busy():
+            time.sleep(0.002)
+
+    def release(self, handle):
+        self.pi.wave_delete(handle)
+
+    def close(self):
+        self.pi.stop()
+
+
+class IRTransmitter:
+    def __init__(self, backend, carrier_hz=CARRIER_HZ, duty_cycle=DUTY_CYCLE):
+        self.backend = backend
+        self.carrier_hz = carrier_hz
+        self.duty_cycle = duty_cycle
+        self._cache = {}    # (name, gap) -> (pulses, backend handle)
+
+    def prepare(self, name, pulses, gap_us=0):
+        """Build and cache the waveform of a command, followed by gap_us of silence"""
+        pulses = tuple(pulses)
+        cached = self._cache.get((name, gap_us))
+        if cached and cached[0] == pulses:
+            return cached[1]
+        if cached:
+            self.backend.release(cached[1])
+        steps = build_waveform(pulses + ((gap_us,) if gap_us else ()),
+                               self.carrier_hz, self.duty_cycle)
+        handle = self.backend.prepare(steps)
+        self._cache[(name, gap_us)] = (pulses, handle)
+        return handle
+
+    def send(self, name, pulses, repeat=1):
+        """Send a command repeat times, with the protocol's gap between frames"""
+        handle = self.prepare(name, pulses)
+        if repeat > 1:
+            spaced = self.prepare(name, pulses, repeat_gap(pulses))
+            for _ in range(repeat - 1):
+                self.backend.play(spaced)
+        self.backend.play(handle)
+
+    def close(self):
+        for _, handle in self._cache.values():
+            self.backend.release(handle)
+        self._cache.clear()
+        self.backend.close()
+
+
+def main():
+    pulses = [9000, 4500]
+    data = 0x04 | 0xFB << 8 | 0x08 << 16 | 0xF7 << 24
+    for bit in range(32):
+        pulses += [562, 1687 if data >> bit & 1 else 562]
+    pulses.append(562)
+
+    backend = RecordingBackend()
+    transmitter = IRTransmitter(backend)
+
+    start = time.perf_counter()
+    transmitter.prepare("test", pulses)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    transmitter.prepare("test", pulses)
+    cached_us = (time.perf_counter() - start) * 1e6
+
+    transmitter.send("test", pulses)
+    received = demodulate(backend.edges)
+    errors = [abs(a - b) for a, b in zip(received, pulses)]
+    period = 1e6 / CARRIER_HZ
+
+    print("\n=== IR Transmit Timing Check ===")
+    print(f"Waveform: {len(backend.edges)} edges, built in {build_ms:.2f} ms, cached lookup {cached_us:.1f} us")
+    print(f"Pulses: sent {len(pulses)}, received {len(received)}")
+    print(f"Width error: max {max(errors)} us (carrier period {period:.1f} us)")
+
+    backend.edges.clear()
+    transmitter.send("test", pulses, repeat=3)
+    received = demodulate(backend.edges)
+    gaps = received[len(pulses)::len(pulses) + 1]
+    print(f"Repeat x3: received {len(received)} pulses, gaps between frames {gaps} us")
+
+
+if __name__ == "__main__":
+    main()
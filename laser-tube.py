@@ -7,9 +7,15 @@ Tests a KY-008 laser module connected to GPIO
 import RPi.GPIO as GPIO
 import time
 
+from animation import Scheduler, blink
+from pwm_engine import PWMEngine
+
 # GPIO pin configuration
 LASER_PIN = 17  # GPIO17 (Pin 11 on Raspberry Pi)
 
+pwm = PWMEngine()
+scheduler = Scheduler()
+
 def setup():
     """Initialize GPIO settings"""
     GPIO.setmode(GPIO.BCM)
@@ -28,24 +34,14 @@ def laser_off():
     print("Laser OFF")
 
 def blink_laser(times=5, delay=0.5):
-    """Blink the laser a specified number of times"""
+    """Blink the laser a specified number of times, runs in the background"""
     print("Blinking laser {} times...".format(times))
-    for i in range(times):
-        laser_on()
-        time.sleep(delay)
-        laser_off()
-        time.sleep(delay)
+    return scheduler.play(LASER_PIN, blink(times, delay))
 
-def pulse_laser(duration=5):
-    """Create a pulsing effect with the laser"""
+def pulse_laser(duration=5, period=1.0):
+    """Create a pulsing effect with the laser, runs in the background"""
     print("Pulsing laser for {} seconds...".format(duration))
-    start_time = time.time()
-    while (time.time() - start_time) < duration:
-        for brightness in range(0, 101, 5):
-            GPIO.output(LASER_PIN, GPIO.HIGH)
-            time.sleep(0.001 * (brightness / 100))
-            GPIO.output(LASER_PIN, GPIO.LOW)
-            time.sleep(0.001 * (1 - brightness / 100))
+    return pwm.pulse(LASER_PIN, period=period, duration=duration)
 
 def main():
     """Main test routine"""
@@ -60,11 +56,12 @@ def main():
         time.sleep(1)
         
         print("\n2. Testing blink pattern...")
-        blink_laser(times=10, delay=0.2)
+        blink_laser(times=10, delay=0.2).wait()
         time.sleep(1)
         
         print("\n3. Testing pulse effect...")
-        pulse_laser(duration=3)
+        pulse_laser(duration=3).wait()
+        pwm.release(LASER_PIN)
         
         print("\n4. Interactive mode - Press Enter to toggle, 'q' to quit")
         laser_state = False
@@ -82,6 +79,8 @@ def main():
         print("\nTest interrupted by user")
     
     finally:
+        scheduler.shutdown()
+        pwm.stop()
         laser_off()
         GPIO.cleanup()
         print("GPIO cleaned up. Test completed.")
@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
+import os
+import sys
 import RPi.GPIO as GPIO
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from animation import Scheduler, Timeline
+from pwm_engine import PWMEngine, UPDATE_HZ
+from color import DUTY, transition
+from gpiomem import open_gpiomem
+
 # ───── Pin Definitions ─────
 PIN_BLUE  = 17
 PIN_GREEN = 27
@@ -15,49 +23,89 @@ for pin in (PIN_BLUE, PIN_GREEN, PIN_RED):
     GPIO.output(pin, GPIO.LOW)      # LOW = off  <<<< changed
     #GPIO.output(pin, GPIO.HIGH)  # HIGH =ls on rasberry py baord vs gpio /or gpio vs 3v and 5v under thewhat is aoff (common-cathode)
 
+# Register fast path when /dev/gpiomem is there: all three pins in one write
+fast = open_gpiomem() or GPIO
+pwm = PWMEngine()
+scheduler = Scheduler()
+
+COLORS = [("Red",   (1,0,0)),
+          ("Green", (0,1,0)),
+          ("Blue",  (0,0,1)),
+          ("White", (1,1,1)),
+          ("Off",   (0,0,0))]
+
+# (r, g, b) 0-255 stops for the smooth color walk
+TRANSITIONS = [(255, 0, 0), (255, 160, 0), (0, 255, 60),
+               (0, 80, 255), (180, 0, 255), (255, 255, 255), (0, 0, 0)]
+
+current = (0, 0, 0)
+
 def set_color(r: bool, g: bool, b: bool):
     """Drive each channel HIGH to light, LOW to turn off."""
-    GPIO.output(PIN_RED,   GPIO.HIGH if r else GPIO.LOW)   # <<<< swapped
-    GPIO.output(PIN_GREEN, GPIO.HIGH if g else GPIO.LOW)
-    GPIO.output(PIN_BLUE,  GPIO.HIGH if b else GPIO.LOW)
+    pwm.release(PIN_RED, PIN_GREEN, PIN_BLUE)     # hand pins back from fades
+    fast.output([PIN_RED, PIN_GREEN, PIN_BLUE],              # <<<< swapped
+                [GPIO.HIGH if v else GPIO.LOW for v in (r, g, b)])
 #    """Drive each channel LOW to light, HIGH to turn off."""
 #    GPIO.output(PIN_RED,   GPIO.LOW  if r else GPIO.HIGH)
 #    GPIO.output(PIN_GREEN, GPIO.LOW  if g else GPIO.HIGH)
 #    GPIO.output(PIN_BLUE,  GPIO.LOW  if b else GPIO.HIGH)
 
+def color_timelines(colors, hold=4.0):
+    """Per-pin timelines showing each (r, g, b) in turn for hold seconds."""
+    keyframes = {PIN_RED: [], PIN_GREEN: [], PIN_BLUE: []}
+    for i, (r, g, b) in enumerate(colors):
+        for pin, on in ((PIN_RED, r), (PIN_GREEN, g), (PIN_BLUE, b)):
+            keyframes[pin].append((i * hold, on))
+    return {pin: Timeline(frames, length=len(colors) * hold)
+            for pin, frames in keyframes.items()}
+
 def fade_color(pin, duration=1.0, steps=50):
-    """Simple software PWM fade on single pin."""
-    for i in range(steps + 1):
-        duty = i / steps
-        # ON time = duty, OFF = (1-duty)
-        GPIO.output(pin, GPIO.LOW)
-        time.sleep(duty * duration / steps)
-        GPIO.output(pin, GPIO.HIGH)
-        time.sleep((1 - duty) * duration / steps)
+    """Background PWM fade on single pin, returns at once."""
+    # Fades out like the original loop (LOW for duty, then HIGH): from full
+    # brightness down to off, gamma-corrected
+    curve = DUTY[[255 * (steps - i) // steps for i in range(steps + 1)]]
+    return pwm.fade(pin, curve, duration)
+
+def fade_to(rgb, duration=1.0, space="hsv"):
+    """Fade the LED from the current color to rgb (0-255), returns at once."""
+    global current
+    # One table row per engine tick, the engine just indexes into it
+    table = transition(current, tuple(rgb), int(duration * UPDATE_HZ) + 1, space)
+    current = tuple(rgb)
+    fades = [pwm.fade(pin, table[:, i], duration)
+             for i, pin in enumerate((PIN_RED, PIN_GREEN, PIN_BLUE))]
+    return fades[-1]
 
 try:
     while True:
-        # Static colors
-        for name, vals in [("Red",   (1,0,0)),
-                           ("Green", (0,1,0)),
-                           ("Blue",  (0,0,1)),
-                           ("White", (1,1,1)),
-                           ("Off",   (0,0,0))]:
-            print(f"Setting {name}")
-            set_color(*vals)
-            time.sleep(4.0)
+        # Static colors, all three pins switch in the same tick
+        print("Showing " + ", ".join(name for name, _ in COLORS))
+        pwm.release(PIN_RED, PIN_GREEN, PIN_BLUE)
+        channels = scheduler.play_group(color_timelines([vals for _, vals in COLORS]))
+        channels[PIN_RED].wait()
 
         # Fade Red → Green → Blue
         print("Fading each channel…")
         for pin in (PIN_RED, PIN_GREEN, PIN_BLUE):
-            fade_color(pin, duration=1.5)
+            fade_color(pin, duration=1.5).wait()
             time.sleep(1.5)
 
+        # Smooth color walk, gamma-corrected and interpolated in HSV
+        print("Color transitions…")
+        current = (0, 0, 0)             # every channel ended its fade off
+        for rgb in TRANSITIONS:
+            fade_to(rgb, duration=1.5).wait()
+            time.sleep(0.5)
+
 except KeyboardInterrupt:
     pass
 
 finally:
     # ───── Cleanup ─────
+    scheduler.shutdown()
+    pwm.stop()
     set_color(0,0,0)
+    if fast is not GPIO:
+        fast.cleanup()
     GPIO.cleanup()
     print("GPIO cleaned up, exiting.")
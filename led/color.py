@@ -0,0 +1,77 @@
+"""
+Gamma-corrected color tables for the RGB LED
+PWM duty cycle is linear in light output but the eye is not, so a linear
+duty ramp looks like it jumps at the dark end. DUTY maps 8-bit color
+values to gamma-corrected duty cycles, and transition() precomputes a
+whole color-to-color fade as a (frames, 3) duty table with NumPy, so
+playing it back is one table row per frame.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+GAMMA = 2.2
+
+# 8-bit color value -> duty cycle (0-100)
+DUTY = 100.0 * (np.arange(256) / 255.0) ** GAMMA
+
+
+def duty(rgb):
+    """Duty cycles for an (r, g, b) color with 0-255 channels"""
+    return tuple(float(DUTY[int(v)]) for v in rgb)
+
+
+def _rgb_to_hsv(rgb):
+    """Rows of RGB (0-1) to HSV (hue in turns, 0-1)"""
+    high = rgb.max(axis=1)
+    low = rgb.min(axis=1)
+    delta = high - low
+    safe = np.where(delta > 0, delta, 1.0)
+    r, g, b = rgb.T
+    hue = np.select([high == r, high == g], [(g - b) / safe % 6, (b - r) / safe + 2],
+                    (r - g) / safe + 4) / 6
+    hue = np.where(delta > 0, hue, 0.0)
+    saturation = np.where(high > 0, delta / np.where(high > 0, high, 1.0), 0.0)
+    return np.stack([hue, saturation, high], axis=1)
+
+
+def _hsv_to_rgb(hsv):
+    """Rows of HSV (hue in turns) to RGB (0-1)"""
+    h, s, v = hsv.T
+    k = (np.array([5, 3, 1])[None, :] + h[:, None] * 6) % 6
+    return v[:, None] - v[:, None] * s[:, None] * np.clip(np.minimum(k, 4 - k), 0, 1)
+
+
+@lru_cache(maxsize=64)
+def transition(start, end, frames, space="hsv"):
+    """
+    Duty table (frames, 3) fading from one (r, g, b) color to another.
+    space="hsv" walks the hue circle the short way round, "linear" blends
+    in linear light. Tables are cached, so repeating a fade is free.
+    """
+    t = np.linspace(0.0, 1.0, max(frames, 2))[:, None]
+    colors = np.array([start, end], dtype=np.float64) / 255.0
+
+    if space == "linear":
+        light = colors ** GAMMA
+        table = (light[0] + (light[1] - light[0]) * t) * 100.0
+    elif space == "hsv":
+        hsv = _rgb_to_hsv(colors)
+        # Black has no hue or saturation, it takes both from the other end;
+        # a grey end takes only the hue, instead of sweeping
+        for side, other in ((0, 1), (1, 0)):
+            if hsv[side, 2] == 0:
+                hsv[side, :2] = hsv[other, :2]
+            elif hsv[side, 1] == 0:
+                hsv[side, 0] = hsv[other, 0]
+        dh = (hsv[1, 0] - hsv[0, 0] + 0.5) % 1.0 - 0.5
+        path = hsv[0] + (hsv[1] - hsv[0]) * t
+        path[:, 0] = (hsv[0, 0] + dh * t[:, 0]) % 1.0
+        table = 100.0 * _hsv_to_rgb(path) ** GAMMA
+    else:
+        raise ValueError(f"Unknown color space: {space}")
+
+    table = np.round(table, 1)
+    table.setflags(write=False)
+    return table
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+PWM benchmark - time.sleep software PWM vs. PWMEngine
+Runs the old pulse_laser loop and the engine's pulse on a simulated pin
+(gpio_sim) and compares CPU use and duty-cycle accuracy. For the loop the
+duty cycle is measured from the logged pin writes, for the engine it is
+the commanded duty against the ideal curve (the PWM signal itself comes
+from RPi.GPIO's C thread), so the two error columns are not comparable.
+"""
+
+import time
+
+import gpio_sim
+gpio_sim.install()
+
+import RPi.GPIO as GPIO
+from pwm_engine import PWMEngine, curve_value
+
+PIN = 17
+DURATION = 3.0
+PERIOD = 1.0
+
+
+def software_pulse(duration):
+    """The original pulse_laser loop"""
+    intended = []
+    start_time = time.time()
+    while (time.time() - start_time) < duration:
+        for brightness in range(0, 101, 5):
+            intended.append(brightness)
+            GPIO.output(PIN, GPIO.HIGH)
+            time.sleep(0.001 * (brightness / 100))
+            GPIO.output(PIN, GPIO.LOW)
+            time.sleep(0.001 * (1 - brightness / 100))
+    return intended
+
+
+def measured_duty(writes):
+    """Duty cycle (0-100) of every HIGH/LOW cycle in the write log"""
+    times = [when for when, pin, _ in writes if pin == PIN]
+    duties = []
+    for rise, fall, next_rise in zip(times[0::2], times[1::2], times[2::2]):
+        duties.append((fall - rise) / (next_rise - rise) * 100)
+    return duties
+
+
+def main():
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(PIN, GPIO.OUT)
+
+    print("\n=== PWM Benchmark ===")
+    print(f"{DURATION:.0f} s pulse effect on a simulated pin\n")
+
+    # Old loop
+    gpio_sim.writes.clear()
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    intended = software_pulse(DURATION)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    duties = measured_duty(gpio_sim.writes)
+    errors = [abs(d - i) for d, i in zip(duties, intended)]
+    print(f"sleep loop: CPU {cpu / wall * 100:5.1f}%, blocked caller {wall:.2f} s, "
+          f"measured duty error mean {sum(errors) / len(errors):5.1f}% max {max(errors):5.1f}%")
+
+    # Engine: gpio_sim's PWM only logs duty changes, there is no signal to
+    # measure, so this is the commanded duty against the curve
+    engine = PWMEngine()
+    curve = [0, 100, 0]
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    fade = engine.pulse(PIN, period=PERIOD, duration=DURATION)
+    returned = time.perf_counter() - wall
+    fade.wait()
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+
+    pwm = engine._pwms[PIN]
+    start_ns = pwm.changes[0][0]
+    errors = []
+    for when, duty in pwm.changes[1:-1]:
+        t = ((when - start_ns) / 1e9 % PERIOD) / PERIOD
+        errors.append(abs(duty - curve_value(curve, t)))
+    engine.stop()
+    print(f"PWMEngine:  CPU {cpu / wall * 100:5.1f}%, blocked caller {returned * 1000:.2f} ms, "
+          f"commanded vs curve mean {sum(errors) / len(errors):5.1f}% max {max(errors):5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
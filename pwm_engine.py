@@ -0,0 +1,158 @@
+"""
+Background brightness engine on GPIO.PWM
+Replaces software PWM loops built from time.sleep slices. The PWM signal
+itself is generated by RPi.GPIO's PWM thread in C; this engine only
+changes the duty cycle along a curve, from one background thread that
+wakes at a fixed update rate on absolute deadlines. Starting a fade
+returns at once.
+
+  engine = PWMEngine()
+  engine.fade(PIN, [0, 100], duration=1.5).wait()
+  engine.pulse(PIN, period=1.0, duration=5)
+"""
+
+import time
+import threading
+
+import RPi.GPIO as GPIO
+
+PWM_FREQUENCY = 500   # Hz, high enough not to flicker
+UPDATE_HZ = 100       # duty-cycle updates per second during a fade
+
+
+def curve_value(curve, t):
+    """Duty cycle at t (0..1) of a callable curve or evenly spaced points"""
+    if callable(curve):
+        return curve(t)
+    if len(curve) == 1:
+        return curve[0]
+    position = min(max(t, 0.0), 1.0) * (len(curve) - 1)
+    i = min(int(position), len(curve) - 2)
+    return curve[i] + (curve[i + 1] - curve[i]) * (position - i)
+
+
+class Fade:
+    """Handle of a running fade"""
+
+    def __init__(self, pin, curve, duration, repeat):
+        self.pin = pin
+        self.curve = curve
+        self.duration = duration
+        self.repeat = repeat      # None = once, 0 = forever, else seconds
+        self.started = time.monotonic()
+        self.done = threading.Event()
+        self.last_duty = None
+
+    def wait(self, timeout=None):
+        """Block until the fade finishes, True if it did"""
+        return self.done.wait(timeout)
+
+    def duty_at(self, now):
+        """Duty cycle at time now, and whether the fade is over"""
+        elapsed = now - self.started
+        if self.repeat is None:
+            return curve_value(self.curve, elapsed / self.duration), elapsed >= self.duration
+        if self.repeat > 0 and elapsed >= self.repeat:
+            return curve_value(self.curve, 1.0), True
+        return curve_value(self.curve, (elapsed % self.duration) / self.duration), False
+
+
+class PWMEngine:
+    def __init__(self, frequency=PWM_FREQUENCY, update_hz=UPDATE_HZ):
+        self.frequency = frequency
+        self.interval = 1.0 / update_hz
+        self._pwms = {}        # pin -> GPIO.PWM
+        self._running = set()  # pins whose PWM is started
+        self._fades = {}       # pin -> Fade
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def _pwm(self, pin, duty):
+        # RPi.GPIO allows a single PWM object per pin, keep and reuse it
+        pwm = self._pwms.get(pin)
+        if pwm is None:
+            pwm = self._pwms[pin] = GPIO.PWM(pin, self.frequency)
+        if pin not in self._running:
+            pwm.start(duty)
+            self._running.add(pin)
+        else:
+            pwm.ChangeDutyCycle(duty)
+
+    def _finish(self, pin):
+        fade = self._fades.pop(pin, None)
+        if fade:
+            fade.done.set()
+
+    def set(self, pin, duty):
+        """Hold a fixed duty cycle (0-100), cancelling any fade on the pin"""
+        with self._cond:
+            self._finish(pin)
+            self._pwm(pin, min(max(duty, 0.0), 100.0))
+
+    def fade(self, pin, curve, duration, repeat=None):
+        """
+        Run a duty-cycle curve in the background and return a Fade.
+        curve is a callable of t in 0..1 or a list of evenly spaced duty
+        values; repeat=None plays it once, 0 loops until cancelled,
+        otherwise it loops for that many seconds.
+        """
+        fade = Fade(pin, curve, duration, repeat)
+        with self._cond:
+            self._finish(pin)
+            self._fades[pin] = fade
+            self._pwm(pin, curve_value(curve, 0.0))
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return fade
+
+    def pulse(self, pin, period=1.0, duration=0, low=0, high=100):
+        """Breathe up and down every period seconds, for duration (0 = forever)"""
+        return self.fade(pin, [low, high, low], period, repeat=duration)
+
+    def release(self, *pins):
+        """Stop PWM on pins so they can be driven with GPIO.output again"""
+        with self._cond:
+            for pin in pins:
+                self._finish(pin)
+                if pin in self._running:
+                    self._pwms[pin].stop()
+                    self._running.discard(pin)
+
+    def stop(self):
+        """Stop the engine and every PWM output"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.release(*list(self._running))
+
+    def _run(self):
+        deadline = time.monotonic()
+        with self._cond:
+            while not self._stopping:
+                if not self._fades:
+                    self._cond.wait()
+                    deadline = time.monotonic()
+                    continue
+
+                now = time.monotonic()
+                for pin, fade in list(self._fades.items()):
+                    duty, finished = fade.duty_at(now)
+                    duty = round(min(max(duty, 0.0), 100.0), 1)
+                    if duty != fade.last_duty:
+                        self._pwm(pin, duty)
+                        fade.last_duty = duty
+                    if finished:
+                        self._finish(pin)
+
+                # Next tick on the fixed grid; skip ticks we already missed
+                deadline += self.interval
+                if deadline < now:
+                    deadline = now + self.interval
+                self._cond.wait(max(deadline - time.monotonic(), 0))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Sensor daemon scaling benchmark
+Watches 1 to 64 simulated switch sensors (gpio_sim), each changing about
+twice a second, once with one poll loop thread per sensor (what running
+every script side by side amounts to, minus the per-process overhead)
+and once with SensorDaemon. Reports CPU, threads and resident memory for
+each count. Pass the seconds per run:
+
+  python3 sensord-benchmark.py 10
+"""
+
+import sys
+import time
+import random
+import threading
+
+import gpio_sim
+gpio_sim.install()
+
+import RPi.GPIO as GPIO
+from sensord import SensorDaemon
+
+COUNTS = (1, 8, 32, 64)
+CHANGE_HZ = 2       # level changes per second per sensor
+POLL = 0.01         # the scripts' loop delay
+FIRST_PIN = 100
+
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+
+def play(pins, duration):
+    """Random level changes on every pin, ending released"""
+    players = []
+    for pin in pins:
+        widths = [random.expovariate(CHANGE_HZ) * 1e6 for _ in range(int(duration * CHANGE_HZ))]
+        players.append(gpio_sim.play(pin, widths[:len(widths) // 2 * 2 - 1], GPIO.LOW))
+    return players
+
+
+def measure(name, count, duration, start, stop):
+    pins = list(range(FIRST_PIN, FIRST_PIN + count))
+    for pin in pins:
+        GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+    gpio_sim.player_cpu = 0.0
+    before = rss_kb()
+    state = start(pins)
+    threads = threading.active_count() - 1    # without the main thread
+    players = play(pins, duration)
+    cpu = time.process_time()
+    start = time.perf_counter()
+    for player in players:
+        player.join()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu - gpio_sim.player_cpu
+    memory = rss_kb() - before
+    events = stop(state)
+    print(f"{name:8} {count:3} sensors  CPU {cpu / elapsed * 100:5.1f}%  "
+          f"threads {threads:3}  RSS +{memory:5} kB  events {events}")
+
+
+def poll_loops(pins):
+    running = [True]
+    changes = [0]
+    def loop(pin):
+        previous = GPIO.input(pin)
+        while running[0]:
+            state = GPIO.input(pin)
+            if state != previous:
+                changes[0] += 1
+                previous = state
+            time.sleep(POLL)
+    for pin in pins:
+        threading.Thread(target=loop, args=(pin,), daemon=True).start()
+    return running, changes
+
+
+def stop_poll_loops(state):
+    running, changes = state
+    running[0] = False
+    time.sleep(2 * POLL)
+    return changes[0]
+
+
+def daemon(pins):
+    config = {"sensors": {f"tilt{pin}": {"type": "tilt", "pin": pin, "handlers": []}
+                          for pin in pins}}
+    sensors = SensorDaemon(config)
+    sensors.start()
+    return sensors
+
+
+def stop_daemon(sensors):
+    sensors.close()
+    return sum(sensor.events for sensor in sensors.sensors)
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    random.seed(25)
+    GPIO.setmode(GPIO.BCM)
+
+    print("\n=== Sensor Daemon Benchmark ===")
+    print(f"{duration:g} s per run, {CHANGE_HZ} changes/s per sensor\n")
+    for count in COUNTS:
+        measure("poll", count, duration, poll_loops, stop_poll_loops)
+        measure("sensord", count, duration, daemon, stop_daemon)
+
+
+if __name__ == "__main__":
+    main()
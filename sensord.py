@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Sensor daemon - every digital sensor in one process
+Loads a pin map and watches all its sensors through one Debouncer: one
+GPIO edge thread and one timer thread no matter how many sensors there
+are, and nothing runs between edges. Every debounced change becomes a
+named event ("tilted", "knock", "flame", ...) passed to the sensor's
+handlers: print, store (EventStore) and alarm (AlarmDispatcher).
+
+  python3 sensord.py [sensors.json]
+
+Pin map:
+  {"sensors": {"tilt": {"type": "tilt", "pin": 17, "handlers": ["print", "alarm"]}},
+   "alarm": {"buzzer": 27, "led": 22, "log": "alarms.log", "webhook": null},
+   "store": "events.db"}
+"""
+
+import sys
+import json
+import time
+import signal
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+import RPi.GPIO as GPIO
+
+from alarms import make_dispatcher
+from debounce import Debouncer
+from event_store import EventStore
+
+SENSOR_MAP = "sensors.json"
+STATS_INTERVAL = 3600    # seconds between printed debounce stats
+
+# pull: input pull resistor, active: level of the "press" event,
+# settings: Debouncer.add() overrides, names: gesture kind -> event name
+SensorType = namedtuple("SensorType", "pull active settings names")
+
+SWITCH = dict(long_ms=None, double_ms=0)
+TYPES = {
+    "button": SensorType(GPIO.PUD_UP, GPIO.LOW, {},
+                         {"press": "press", "release": "release", "double_click": "double_click",
+                          "long_press": "long_press", "repeat": "repeat"}),
+    "tilt": SensorType(GPIO.PUD_UP, GPIO.LOW, dict(SWITCH, debounce_ms=50),
+                       {"press": "tilted", "release": "level"}),
+    "knock": SensorType(GPIO.PUD_UP, GPIO.LOW, dict(SWITCH, leading=True, debounce_ms=150),
+                        {"press": "knock"}),
+    "vibration": SensorType(GPIO.PUD_UP, GPIO.LOW, dict(SWITCH, leading=True, debounce_ms=50),
+                            {"press": "vibration"}),
+    "flame": SensorType(GPIO.PUD_OFF, GPIO.LOW, dict(SWITCH, debounce_ms=100),
+                        {"press": "flame", "release": "no_flame"}),
+    "light": SensorType(GPIO.PUD_OFF, GPIO.HIGH, dict(SWITCH, debounce_ms=100),
+                        {"press": "dark", "release": "light"}),
+}
+HANDLERS = ("print", "store", "alarm")
+
+
+def load_map(path=SENSOR_MAP):
+    """Read and check a pin map, raises ValueError on a bad one"""
+    with open(path) as f:
+        config = json.load(f)
+    pins = {}
+    for name, sensor in config.get("sensors", {}).items():
+        if sensor.get("type") not in TYPES:
+            raise ValueError(f"{name}: unknown type {sensor.get('type')!r}")
+        if "pin" not in sensor:
+            raise ValueError(f"{name}: no pin")
+        for handler in sensor.get("handlers", ["print"]):
+            if handler not in HANDLERS:
+                raise ValueError(f"{name}: unknown handler {handler!r}")
+        if sensor["pin"] in pins:
+            raise ValueError(f"{name}: pin {sensor['pin']} already used by {pins[sensor['pin']]}")
+        pins[sensor["pin"]] = name
+    for output in ("buzzer", "led"):
+        pin = (config.get("alarm") or {}).get(output)
+        if pin in pins:
+            raise ValueError(f"alarm {output}: pin {pin} already used by {pins[pin]}")
+    return config
+
+
+class Sensor:
+    """One configured input: turns its gestures into named events"""
+
+    def __init__(self, name, kind, pin, handlers):
+        self.name = name
+        self.type = TYPES[kind]
+        self.pin = pin
+        self.handlers = handlers
+        self.events = 0
+
+    def on_gesture(self, gesture):
+        event = self.type.names.get(gesture.kind)
+        if event is None:
+            return
+        self.events += 1
+        for handler in self.handlers:
+            handler(self, event, gesture)
+
+
+class SensorDaemon:
+    def __init__(self, config):
+        self.config = config
+        self.debouncer = Debouncer()
+        self.store = None
+        self.alarms = None
+        self.sensors = []
+        # Gestures carry perf_counter_ns, events are logged in wall time
+        self.clock_offset = time.time_ns() - time.perf_counter_ns()
+
+    def _handlers(self, names):
+        handlers = []
+        for name in names:
+            if name == "print":
+                handlers.append(self._print)
+            elif name == "store":
+                if self.store is None:
+                    self.store = EventStore(self.config.get("store", "events.db"))
+                handlers.append(self._store)
+            elif name == "alarm":
+                if self.alarms is None:
+                    alarm = self.config.get("alarm") or {}
+                    self.alarms = make_dispatcher(alarm.get("buzzer"), alarm.get("led"),
+                                                  alarm.get("log"), alarm.get("webhook"))
+                handlers.append(self._alarm)
+            else:
+                raise ValueError(f"Unknown handler {name!r}")
+        return handlers
+
+    def start(self):
+        """Set up every sensor in the map and start watching"""
+        for name, sensor in self.config.get("sensors", {}).items():
+            kind = TYPES[sensor["type"]]
+            GPIO.setup(sensor["pin"], GPIO.IN, pull_up_down=kind.pull)
+            watched = Sensor(name, sensor["type"], sensor["pin"],
+                             self._handlers(sensor.get("handlers", ["print"])))
+            self.debouncer.add(sensor["pin"], handler=watched.on_gesture, active=kind.active,
+                               **kind.settings)
+            self.sensors.append(watched)
+
+    def wall_time(self, when_ns):
+        return (when_ns + self.clock_offset) / 1e9
+
+    def _print(self, sensor, event, gesture):
+        stamp = datetime.fromtimestamp(self.wall_time(gesture.when_ns)).strftime("%H:%M:%S.%f")[:-3]
+        print(f"[{stamp}] {sensor.name:12} {event}", flush=True)
+
+    def _store(self, sensor, event, gesture):
+        self.store.record(sensor.name, event, when=self.wall_time(gesture.when_ns))
+
+    def _alarm(self, sensor, event, gesture):
+        # Only the active edge alarms, not the return to normal
+        if gesture.kind == "press":
+            self.alarms.raise_alarm(sensor.name, f"{event} detected")
+
+    def report(self):
+        """Per-sensor event counts and the debounce stats as printable lines"""
+        lines = [f"{sensor.name:12} pin {sensor.pin:2}  {sensor.events} events"
+                 for sensor in self.sensors]
+        lines.append(self.debouncer.report())
+        if self.alarms:
+            lines.append(self.alarms.report())
+        return "\n".join(lines)
+
+    def close(self):
+        self.debouncer.close()
+        if self.alarms:
+            self.alarms.close()
+        if self.store:
+            self.store.close()
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else SENSOR_MAP
+    try:
+        config = load_map(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Can't load pin map {path}: {e}")
+        sys.exit(1)
+
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setwarnings(False)
+    daemon = SensorDaemon(config)
+
+    # SIGTERM (systemd stop) shuts down the same way as Ctrl+C
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    try:
+        daemon.start()
+        print(f"Watching {len(daemon.sensors)} sensors from {path}")
+        for sensor in daemon.sensors:
+            # Debouncing starts from the current level, so say if it is active already
+            active = " (active now)" if GPIO.input(sensor.pin) == sensor.type.active else ""
+            print(f"  {sensor.name:12} pin {sensor.pin:2}  {sensor.type.names['press']}{active}")
+        while not stopping.wait(STATS_INTERVAL):
+            print(daemon.report(), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        print("\n" + daemon.report())
+        GPIO.cleanup()
+
+
+if __name__ == "__main__":
+    main()
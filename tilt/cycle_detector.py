@@ -0,0 +1,100 @@
+"""
+Washing machine cycle detection from edge timestamps
+The detector only looks at when the switch changed, never at how many
+loop ticks went by. The event rate over a sliding window drives the
+phases, with separate enter/leave thresholds so they don't flap:
+
+  idle -> wash   rate >= start_rate for start_hold seconds
+  wash -> spin   rate >= spin_rate, back to wash below spin_exit
+  wash/spin -> idle   no edge for stop_quiet seconds; the cycle is
+                      reported as finished at its last edge
+
+next_deadline() says when the state could change without a new edge, so
+a caller can sleep until then (or forever when idle).
+
+  detector = CycleDetector()
+  for when, old, new in detector.feed(time.monotonic()):
+    print(old, "->", new)
+"""
+
+from collections import deque
+
+IDLE = "idle"
+WASH = "wash"
+SPIN = "spin"
+
+WINDOW = 10.0       # seconds of edges the rate is taken over
+START_RATE = 0.5    # edges/s to consider the machine running
+START_HOLD = 20.0   # seconds the rate has to hold before a cycle starts
+STOP_QUIET = 30.0   # seconds without an edge that end a cycle
+SPIN_RATE = 5.0     # edges/s to enter spin
+SPIN_EXIT = 3.0     # edges/s to leave spin
+
+
+class CycleDetector:
+  def __init__(self, window=WINDOW, start_rate=START_RATE, start_hold=START_HOLD,
+               stop_quiet=STOP_QUIET, spin_rate=SPIN_RATE, spin_exit=SPIN_EXIT):
+    self.window = window
+    self.start_rate = start_rate
+    self.start_hold = start_hold
+    self.stop_quiet = stop_quiet
+    self.spin_rate = spin_rate
+    self.spin_exit = spin_exit
+    self.state = IDLE
+    self.started = None       # start of the running cycle
+    self.last_edge = None
+    self.cycles = []          # (start, end) of every finished cycle
+    self._edges = deque()     # edge times inside the window
+    self._above_since = None  # when the rate first reached start_rate
+
+  def rate(self, now):
+    """Edges per second over the window ending at now"""
+    edges = self._edges
+    while edges and edges[0] + self.window <= now:
+      edges.popleft()
+    return len(edges) / self.window
+
+  def feed(self, when):
+    """Add an edge, returns the state changes as (time, old, new)"""
+    self._edges.append(when)
+    self.last_edge = when
+    return self.update(when, edge=True)
+
+  def update(self, now, edge=False):
+    """Re-evaluate at time now, returns the state changes"""
+    changes = []
+    rate = self.rate(now)
+    if self.state == IDLE:
+      if rate >= self.start_rate:
+        if self._above_since is None:
+          self._above_since = self._edges[0]
+        if now >= self._above_since + self.start_hold:
+          self.started = self._above_since
+          self._change(WASH, self.started, changes)
+      else:
+        self._above_since = None
+    elif now >= self.last_edge + self.stop_quiet:
+      self.cycles.append((self.started, self.last_edge))
+      self._change(IDLE, self.last_edge, changes)
+      self.started = None
+      self._above_since = None
+    elif self.state == WASH and rate >= self.spin_rate:
+      self._change(SPIN, now, changes)
+    elif self.state == SPIN and edge and rate < self.spin_exit:
+      # Only on an edge: a window draining after the last edge is the
+      # machine stopping, not the spin slowing down
+      self._change(WASH, now, changes)
+    return changes
+
+  def _change(self, state, when, changes):
+    changes.append((when, self.state, state))
+    self.state = state
+
+  def next_deadline(self):
+    """Time update() has to run by if no edge comes, None to wait forever"""
+    # Same expressions as update() so a wakeup always makes progress
+    if self.state != IDLE:
+      return self.last_edge + self.stop_quiet
+    if self._above_since is not None:
+      return self._above_since + self.start_hold
+    return None
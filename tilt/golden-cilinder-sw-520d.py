@@ -2,10 +2,18 @@
 # filepath: /home/user/my-iot-scripts/tilt_sensor_test.py
 
 import RPi.GPIO as GPIO
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "vibration"))
+from edge_ring import EdgeRing
+from shake import ShakeEstimator
+
 # Configuration
 TILT_PIN = 17  # Connect DO to this GPIO pin
+DISPLAY_HZ = 10   # shake readout refresh rate
+BAR_WIDTH = 40    # Hz at the full bar
 
 def setup():
   """Initialize GPIO settings"""
@@ -115,6 +123,8 @@ def sensitivity_test():
 
 def shake_detector():
   """Detect shaking/vibration"""
+  ring = EdgeRing(TILT_PIN)
+  shake = ShakeEstimator()
   try:
     setup()
     
@@ -122,36 +132,44 @@ def shake_detector():
     print("Shake the sensor to detect motion")
     print("Press Ctrl+C to exit\n")
     
-    shake_count = 0
-    last_change_time = time.time()
-    
-    previous_state = GPIO.input(TILT_PIN)
+    # Edges are timestamped in the GPIO callback, the loop only reads them
+    ring.start()
+    next_display = time.perf_counter()
     
     while True:
-      current_state = GPIO.input(TILT_PIN)
-      current_time = time.time()
+      for ns, level in ring.read():
+        done = shake.feed(ns, level)
+        if done:
+          print_shake(done, shake.shakes)
+        if shake.shaking and shake.edges == 1:
+          print(f"\rSHAKE detected! #{shake.shakes + 1} 🟫" + " " * 30)
+      done = shake.update(time.perf_counter_ns())
+      if done:
+        print_shake(done, shake.shakes)
       
-      # Detect state change (shake)
-      if current_state != previous_state:
-        time_diff = current_time - last_change_time
-        
-        # If rapid changes, consider it shaking
-        if time_diff < 0.5:  # Less than 0.5 seconds
-          shake_count += 1
-          print(f"SHAKE detected! #{shake_count} 🟫")
-        
-        last_change_time = current_time
-        previous_state = current_state
+      reading = shake.reading(time.perf_counter_ns())
+      bar = "█" * min(BAR_WIDTH, int(reading.hz))
+      print(f"\r{reading.hz:6.1f} Hz  dwell {reading.dwell:4.2f}  {bar:{BAR_WIDTH}}",
+            end="", flush=True)
       
-      time.sleep(0.01)
+      # Deadline based so the display rate doesn't drift
+      next_display += 1 / DISPLAY_HZ
+      time.sleep(max(0, next_display - time.perf_counter()))
       
   except KeyboardInterrupt:
-    print(f"\n\nTotal shakes detected: {shake_count}")
+    print(f"\n\nTotal shakes detected: {shake.shakes}")
+    if ring.overruns:
+      print(f"Edges lost: {ring.overruns}")
     print("Program interrupted by user")
   
   finally:
     GPIO.cleanup()
 
+def print_shake(done, number):
+  """Summary of a shake that just ended"""
+  print(f"\rShake #{number} over: {(done.end_ns - done.start_ns) / 1e9:.1f} s, "
+        f"{done.toggles} toggles, peak {done.peak_hz:.1f} Hz" + " " * 20)
+
 if __name__ == "__main__":
   print("\nChoose test mode:")
   print("1. Basic tilt detection")
@@ -2,10 +2,23 @@
 # filepath: /home/user/my-iot-scripts/tilt_switch_test.py
 
 import RPi.GPIO as GPIO
+import os
+import sys
 import time
+import queue
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from event_store import EventStore
+from alarms import make_dispatcher
+from cycle_detector import CycleDetector, IDLE, WASH, SPIN
+
 TILT_PIN = 17  # Connect S pin to this GPIO
+ALARM_BUZZER_PIN = 27
+ALARM_LED_PIN = 22
+ALARM_LOG = "alarms.log"
+ALARM_WEBHOOK = "http://localhost:8080/alarm"   # None to disable
+ALARM_HOLDOFF = 0.5   # seconds before a new movement can alarm again
 
 def setup():
   """Initialize GPIO settings"""
@@ -99,8 +112,11 @@ def angle_finder():
 
 def theft_alarm():
   """Simple theft/movement alarm"""
+  store = EventStore()
+  alarms = None
   try:
     setup()
+    alarms = make_dispatcher(ALARM_BUZZER_PIN, ALARM_LED_PIN, ALARM_LOG, ALARM_WEBHOOK)
     print("\n=== Theft Alarm Mode ===")
     print("Place on object to protect")
     print("Alarm triggers on movement")
@@ -113,75 +129,77 @@ def theft_alarm():
     
     # Get initial state
     initial_state = GPIO.input(TILT_PIN)
-    alarm_triggered = False
+    previous_state = initial_state
+    last_alarm = 0
     
     while True:
       current_state = GPIO.input(TILT_PIN)
+      now = time.monotonic()
       
-      # Detect any change from initial state
-      if current_state != initial_state and not alarm_triggered:
-        print("\n🚨 ALARM! MOVEMENT DETECTED! 🚨")
-        print(f"Time: {datetime.now()}")
-        alarm_triggered = True
-        
-        # Sound alarm (visual)
-        for _ in range(20):
-          print("!", end="", flush=True)
-          time.sleep(0.1)
-        
-        print("\n\nPress Ctrl+C to reset")
+      # Every move away from the initial state alarms, the loop never stops sampling
+      if (current_state != initial_state and previous_state == initial_state
+          and now - last_alarm > ALARM_HOLDOFF):
+        alarms.raise_alarm("tilt", "Movement detected")
+        store.record("tilt", "alarm", current_state)
+        last_alarm = now
+        print(f"\n🚨 ALARM #{alarms.raised}! MOVEMENT DETECTED! 🚨 {datetime.now()}")
+      previous_state = current_state
       
       time.sleep(0.05)
       
   except KeyboardInterrupt:
     print("\n\nAlarm disarmed")
   finally:
+    if alarms:
+      alarms.close()
+      print(alarms.report())
+    store.close()
     GPIO.cleanup()
 
 def washing_machine_monitor():
-  """Detect washing machine completion"""
+  """Detect washing machine cycles from edge timestamps"""
+  detector = CycleDetector()
+  edges = queue.SimpleQueue()
+  labels = {WASH: "🌊 Washing", SPIN: "🌀 Spinning"}
+
+  def clock(t):
+    # Wall clock time of a monotonic timestamp
+    return datetime.fromtimestamp(time.time() - (time.monotonic() - t)).strftime("%H:%M:%S")
+
   try:
     setup()
     print("\n=== Washing Machine Monitor ===")
     print("Attach to washing machine")
-    print("Detects when vibration stops")
+    print("Detects wash, spin and when vibration stops")
     print("Press Ctrl+C to exit\n")
     
-    vibration_count = 0
-    quiet_time = 0
-    running = False
+    # The callback only timestamps the edge, all timing comes from those
+    GPIO.add_event_detect(TILT_PIN, GPIO.BOTH,
+                          callback=lambda channel: edges.put(time.monotonic()))
+    print("⏸️  Idle")
     
     while True:
-      state = GPIO.input(TILT_PIN)
-      
-      # Count vibrations
-      if state == 0:
-        vibration_count += 1
-        quiet_time = 0
-        
-        if not running and vibration_count > 5:
-          print("\n🌊 Washing started!")
-          running = True
-      else:
-        quiet_time += 1
-      
-      # Check if stopped (30 sec quiet)
-      if running and quiet_time > 600:  # 30 sec
-        print("\n✅ Washing complete!")
-        running = False
-        vibration_count = 0
-      
-      # Status display
-      if running:
-        print(f"\r🌊 Running... ({vibration_count} vibes)",
-              end="", flush=True)
-      else:
-        print(f"\r⏸️  Idle", end="", flush=True)
-      
-      time.sleep(0.05)
+      # Sleep until the next edge, or until the state could change without one
+      deadline = detector.next_deadline()
+      try:
+        timeout = None if deadline is None else max(0, deadline - time.monotonic())
+        changes = detector.feed(edges.get(timeout=timeout))
+      except queue.Empty:
+        changes = detector.update(time.monotonic())
+      
+      for when, old, new in changes:
+        if new == IDLE:
+          minutes = (when - detector.cycles[-1][0]) / 60
+          print(f"{clock(when)} ✅ Washing complete! ({minutes:.0f} min)")
+        elif old == IDLE:
+          print(f"{clock(when)} 🌊 Washing started!")
+        else:
+          print(f"{clock(when)} {labels[new]} ({detector.rate(time.monotonic()):.1f} vibes/s)")
       
   except KeyboardInterrupt:
     print("\n\nMonitor stopped")
+    for start, end in detector.cycles:
+      print(f"Cycle {clock(start)} - {clock(end)} ({(end - start) / 60:.0f} min)")
   finally:
     GPIO.cleanup()
 
@@ -1,37 +1,40 @@
 import RPi.GPIO as GPIO
-import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from debounce import Debouncer
 
 # Pin definitions
 PIN_TILT = 18
+SETTLE_MS = 50   # the ball has to rest this long before a change counts
 
 # Setup
 GPIO.setmode(GPIO.BCM)
 GPIO.setwarnings(False)
 GPIO.setup(PIN_TILT, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
+# Tilted is the "pressed" level, no long press or double click needed
+switch = Debouncer(debounce_ms=SETTLE_MS)
+switch.add(PIN_TILT, long_ms=None, double_ms=0)
+
 try:
     print("Tilt Switch Module Test")
     print("Tilt the sensor to trigger it")
     print("Press Ctrl+C to exit")
     
-    last_state = GPIO.input(PIN_TILT)
-    print(f"Initial state: {'Tilted' if last_state == GPIO.LOW else 'Level'}")
+    print(f"Initial state: {'Tilted' if GPIO.input(PIN_TILT) == GPIO.LOW else 'Level'}")
     
     while True:
-        current_state = GPIO.input(PIN_TILT)
-        
-        if current_state != last_state:
-            if current_state == GPIO.LOW:
-                print("TILTED! Switch activated")
-            else:
-                print("LEVEL - Switch deactivated")
-            
-            last_state = current_state
-        
-        time.sleep(0.1)
+        gesture = switch.events.get()
+        if gesture.kind == "press":
+            print("TILTED! Switch activated")
+        else:
+            print("LEVEL - Switch deactivated")
 
 except KeyboardInterrupt:
     print("\nProgram interrupted")
 finally:
+    switch.close()
     GPIO.cleanup()
     print("GPIO cleaned up")
\ No newline at end of file
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Buzzer timing benchmark - time.sleep loop vs. Sequencer
+Plays the 0.5 s beep with the original sleep loop and with the pattern
+sequencer on a simulated pin (gpio_sim), then reports edge jitter and how
+far the last edge drifted from its ideal time. Pass a duration in seconds
+for long runs:
+
+  python3 tone-benchmark.py 3600
+"""
+
+import sys
+import time
+
+import gpio_sim
+gpio_sim.install()
+
+import RPi.GPIO as GPIO
+from tone_patterns import Sequencer
+
+PIN = 17
+HALF = 0.5
+
+
+def edge_errors(start_ns):
+    """Offset of every logged write from its ideal HALF grid time, in ms"""
+    errors = []
+    for i, (when, pin, _) in enumerate(w for w in gpio_sim.writes if w[0] >= start_ns):
+        errors.append(((when - start_ns) / 1e9 - i * HALF) * 1000)
+    return errors
+
+
+def report(name, errors, cpu, wall):
+    jitter = [abs(b - a) for a, b in zip(errors, errors[1:])]
+    print(f"{name:10} edges {len(errors):5}, jitter mean {sum(jitter) / len(jitter):.3f} ms "
+          f"max {max(jitter):.3f} ms, drift at end {errors[-1]:8.3f} ms, CPU {cpu / wall * 100:.1f}%")
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(PIN, GPIO.OUT)
+
+    print("\n=== Buzzer Timing Benchmark ===")
+    print(f"{duration:.0f} s of {HALF} s beeps on a simulated pin\n")
+
+    # Original loop
+    gpio_sim.writes.clear()
+    start_ns = time.perf_counter_ns()
+    cpu = time.process_time()
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        GPIO.output(PIN, GPIO.HIGH)
+        print("Beep!", end="\r")
+        time.sleep(HALF)
+        GPIO.output(PIN, GPIO.LOW)
+        print("Silent", end="\r")
+        time.sleep(HALF)
+    report("sleep loop", edge_errors(start_ns), time.process_time() - cpu, duration)
+
+    # Sequencer
+    gpio_sim.writes.clear()
+    sequencer = Sequencer(PIN)
+    cpu = time.process_time()
+    sequencer.play("beep", repeat=int(duration / (2 * HALF)))
+    start_ns = time.perf_counter_ns()
+    sequencer.wait()
+    cpu = time.process_time() - cpu
+    writes = gpio_sim.writes[:-1]       # last one is the stop() silence
+    gpio_sim.writes[:] = writes
+    report("Sequencer", edge_errors(writes[0][0]), cpu, duration)
+    print(f"{'':10} worst lateness {sequencer.max_late * 1000:.3f} ms, "
+          f"mean {sequencer.total_late / sequencer.edges * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
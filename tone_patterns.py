@@ -0,0 +1,147 @@
+"""
+Drift-free beep pattern sequencer for buzzers
+Patterns are written as a compact spec and played in a background thread
+that waits for each edge on its own absolute monotonic deadline
+(start + cycle * length + offset), sleeping most of the way and spinning
+the last fraction of a millisecond. Nothing accumulates, so the beat after
+an hour is as exact as the first one. stop() cancels mid-pattern.
+
+Spec: whitespace separated tokens, times in milliseconds
+  "200"        beep for 200 ms
+  "~300"       silence for 300 ms
+  "(...)x3"    repeat a group
+
+  seq = Sequencer(BUZZER_PIN)
+  seq.play("sos", repeat=0)     # name from PATTERNS or a spec, 0 = forever
+  seq.stop()
+"""
+
+import re
+import time
+import threading
+
+import RPi.GPIO as GPIO
+
+from animation import Timeline
+
+SPIN = 0.0005     # last stretch before an edge is spun, not slept
+
+PATTERNS = {
+    "beep": "500 ~500",
+    "sos": "(100 ~100)x3 ~200 (300 ~100)x3 ~200 (100 ~100)x3 ~600",
+    "escalating": "400 ~400 300 ~300 200 ~200 (100 ~100)x4 (50 ~50)x8",
+    "chirp": "30 ~70 30 ~870",
+    "alarm": "(150 ~50)x4 ~600",
+}
+
+_TOKEN = re.compile(r"\(|\)x(\d+)|~?\d+(?:\.\d+)?")
+
+
+def parse(spec):
+    """Spec (or PATTERNS name) to a list of (on, seconds) steps"""
+    spec = PATTERNS.get(spec, spec)
+    stack = [[]]
+    pos = 0
+    for match in _TOKEN.finditer(spec):
+        if spec[pos:match.start()].strip():
+            raise ValueError(f"Bad pattern spec at {pos}: {spec!r}")
+        pos = match.end()
+        token = match.group(0)
+        if token == "(":
+            stack.append([])
+        elif token.startswith(")"):
+            if len(stack) == 1:
+                raise ValueError(f"Unbalanced ')' in pattern spec: {spec!r}")
+            group = stack.pop()
+            stack[-1].extend(group * int(match.group(1)))
+        elif token.startswith("~"):
+            stack[-1].append((False, float(token[1:]) / 1000))
+        else:
+            stack[-1].append((True, float(token) / 1000))
+    if spec[pos:].strip() or len(stack) != 1:
+        raise ValueError(f"Bad pattern spec: {spec!r}")
+    return stack[0]
+
+
+def timeline(spec, loop=False):
+    """Pattern spec as an animation Timeline"""
+    keyframes = []
+    t = 0.0
+    for on, seconds in parse(spec):
+        keyframes.append((t, on))
+        t += seconds
+    return Timeline(keyframes, length=t, loop=loop)
+
+
+class Sequencer:
+    def __init__(self, pin, spin=SPIN):
+        self.pin = pin
+        self.spin = spin
+        self.edges = 0
+        self.max_late = 0.0      # worst edge lateness in seconds
+        self.total_late = 0.0
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+        self._thread = None
+
+    def play(self, pattern, repeat=1):
+        """Play a spec, PATTERNS name or Timeline repeat times (0 = forever)"""
+        self.stop()
+        if not isinstance(pattern, Timeline):
+            pattern = timeline(pattern)
+        if pattern.length <= 0:
+            raise ValueError("Pattern has no steps to play")
+        self._cancel.clear()
+        self._done.clear()
+        self._thread = threading.Thread(target=self._run, args=(pattern, repeat), daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until the pattern has played out or was stopped"""
+        return self._done.wait(timeout)
+
+    def stop(self):
+        """Cancel mid-pattern and silence the pin"""
+        self._cancel.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _wait_until(self, deadline):
+        # Sleep until just before the deadline, spin the rest
+        remaining = deadline - time.monotonic()
+        if remaining > self.spin and self._cancel.wait(remaining - self.spin):
+            return False
+        while time.monotonic() < deadline:
+            pass
+        return not self._cancel.is_set()
+
+    def _run(self, pattern, repeat):
+        edges = list(zip(pattern.times, pattern.values))
+        length = pattern.length
+        level = None
+        start = time.monotonic() + self.spin
+        cycle = 0
+        try:
+            while repeat == 0 or cycle < repeat:
+                for offset, value in edges:
+                    if value == level:
+                        continue
+                    deadline = start + cycle * length + offset
+                    if not self._wait_until(deadline):
+                        return
+                    GPIO.output(self.pin, value)
+                    late = time.monotonic() - deadline
+                    level = value
+                    self.edges += 1
+                    self.total_late += late
+                    self.max_late = max(self.max_late, late)
+                cycle += 1
+                # Also paces a cycle with no level change left to wait for
+                if not self._wait_until(start + cycle * length):
+                    return
+        finally:
+            GPIO.output(self.pin, GPIO.LOW)
+            self._done.set()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Vectorized analytics for vibration recordings
+Works through an edge log (edge_log.EdgeLog) block by block with NumPy,
+so memory depends on the recording length only through the coarse
+activity bins, never on the number of edges:
+
+  - event rate and duty cycle over sliding windows (1 s / 10 s / 60 s)
+  - Welch power spectrum of the event train to find periodic sources
+    such as a motor
+  - burst segmentation: runs of events separated by quiet gaps
+
+  report = analyze("pump.vib")
+  report.peak_hz, report.rate[10], report.bursts
+
+  python3 analytics.py pump.vib
+"""
+
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from edge_log import EdgeLog
+
+RESOLUTION = 0.1        # seconds per activity bin
+WINDOWS = (1, 10, 60)   # sliding windows in seconds
+SPECTRUM_HZ = 1000      # sample rate of the event train for the spectrum
+SEGMENT = 8.192         # seconds per spectrum segment
+MIN_HZ = 0.5            # ignore slower "periods" when picking the peak
+BURST_GAP = 0.5         # seconds of quiet that end a burst
+
+Report = namedtuple("Report", "start_s rate duty freqs power peak_hz bursts")
+Bursts = namedtuple("Bursts", "start_s end_s events")
+
+
+class Analyzer:
+  """Streaming accumulator, feed() it edge blocks in time order"""
+
+  def __init__(self, duration_ns, resolution=RESOLUTION, spectrum_hz=SPECTRUM_HZ,
+               segment=SEGMENT, burst_gap=BURST_GAP):
+    self.res_ns = int(resolution * 1e9)
+    self.nbins = duration_ns // self.res_ns + 1
+    self.falls = np.zeros(self.nbins, dtype=np.int32)
+    self.low_at = np.zeros(self.nbins + 1)   # low ns before each bin boundary
+    self._filled = 0                         # boundaries filled in so far
+    self._t = 0                              # last edge, level after it and
+    self._level = 1                          # low ns up to it (SW-420 idles HIGH)
+    self._low = 0.0
+
+    self.spectrum_hz = spectrum_hz
+    self.seg_n = int(segment * spectrum_hz)
+    self.seg_ns = self.seg_n * 1_000_000_000 // spectrum_hz
+    self.taper = np.hanning(self.seg_n)
+    self.power = np.zeros(self.seg_n // 2 + 1)
+    self.segments = 0
+    self._seg_start = 0
+    self._pending = []                       # falls in the open segment
+
+    self.gap_ns = int(burst_gap * 1e9)
+    self._bursts = []
+    self._burst = None                       # [start, last, events]
+
+  def feed(self, times, levels):
+    if not len(times):
+      return
+    falls = times[levels == 0]
+    self._activity(times, levels, falls)
+    self._spectrum(falls)
+    self._segment_bursts(falls)
+
+  def _activity(self, times, levels, falls):
+    res = self.res_ns
+    if len(falls):
+      idx = falls // res
+      counts = np.bincount(idx - idx[0])
+      self.falls[idx[0]:idx[0] + len(counts)] += counts.astype(np.int32)
+
+    # Low time at every bin boundary up to the last edge: cumulative low
+    # time at the edges, extended linearly to each boundary
+    t = np.concatenate(([self._t], times))
+    low_level = np.concatenate(([self._level], levels)) == 0
+    low = self._low + np.concatenate(([0], np.cumsum(np.diff(t) * low_level[:-1])))
+    last = min(times[-1] // res, self.nbins)
+    bounds = np.arange(self._filled, last + 1, dtype=np.int64) * res
+    j = np.searchsorted(t, bounds, side="right") - 1
+    self.low_at[self._filled:last + 1] = low[j] + (bounds - t[j]) * low_level[j]
+    self._filled = last + 1
+    self._t, self._level, self._low = t[-1], levels[-1], low[-1]
+
+  def _spectrum(self, falls):
+    # Split the falls at segment ends, one FFT per finished segment
+    while len(falls):
+      end = self._seg_start + self.seg_ns
+      cut = np.searchsorted(falls, end)
+      self._pending.append(falls[:cut])
+      if cut == len(falls):
+        return
+      self._close_segment()
+      falls = falls[cut:]
+      # Jump over empty segments, they add nothing but their count
+      skip = (falls[0] - self._seg_start) // self.seg_ns
+      self.segments += skip
+      self._seg_start += skip * self.seg_ns
+
+  def _close_segment(self):
+    falls = np.concatenate(self._pending)
+    self._pending = []
+    if len(falls):
+      idx = (falls - self._seg_start) * self.spectrum_hz // 1_000_000_000
+      train = np.bincount(idx, minlength=self.seg_n)[:self.seg_n].astype(np.float64)
+      train -= train.mean()
+      self.power += np.abs(np.fft.rfft(train * self.taper)) ** 2
+    self.segments += 1
+    self._seg_start += self.seg_ns
+
+  def _segment_bursts(self, falls):
+    if not len(falls):
+      return
+    if self._burst is None:
+      self._burst = [falls[0], falls[0], 0]
+    previous = np.concatenate(([self._burst[1]], falls[:-1]))
+    starts = np.flatnonzero(falls - previous > self.gap_ns)
+    if not len(starts):
+      self._burst[1] = falls[-1]
+      self._burst[2] += len(falls)
+      return
+    # The open burst ends before the first gap, whole bursts lie between gaps
+    first, last, events = self._burst
+    closed_start = np.concatenate(([first], falls[starts[:-1]]))
+    closed_end = previous[starts]
+    closed_events = np.diff(np.concatenate(([0], starts)))
+    closed_events[0] += events
+    self._bursts.append((closed_start, closed_end, closed_events))
+    self._burst = [falls[starts[-1]], falls[-1], len(falls) - starts[-1]]
+
+  def finish(self, windows=WINDOWS):
+    """Close open state and return a Report"""
+    res = self.res_ns
+    if self._filled <= self.nbins:
+      bounds = np.arange(self._filled, self.nbins + 1, dtype=np.int64) * res
+      self.low_at[self._filled:] = self._low + (bounds - self._t) * (self._level == 0)
+    if self._pending:
+      self._close_segment()
+    if self._burst is not None:
+      first, last, events = self._burst
+      self._bursts.append(([first], [last], [events]))
+      self._burst = None
+
+    low = np.diff(self.low_at)
+    falls_sum = np.concatenate(([0], np.cumsum(self.falls, dtype=np.int64)))
+    low_sum = np.concatenate(([0], np.cumsum(low)))
+    rate = {}
+    duty = {}
+    for window in windows:
+      n = max(1, round(window * 1e9 / res))
+      end = np.arange(1, self.nbins + 1)
+      begin = np.maximum(end - n, 0)
+      span = (end - begin) * res
+      rate[window] = (falls_sum[end] - falls_sum[begin]) / (span / 1e9)
+      duty[window] = (low_sum[end] - low_sum[begin]) / span * 100
+
+    freqs = np.fft.rfftfreq(self.seg_n, 1.0 / self.spectrum_hz)
+    power = self.power / max(self.segments, 1)
+    usable = freqs >= MIN_HZ
+    peak_hz = float(freqs[usable][np.argmax(power[usable])]) if power[usable].any() else None
+
+    if self._bursts:
+      starts, ends, events = (np.concatenate(part) for part in zip(*self._bursts))
+    else:
+      starts = ends = events = np.empty(0)
+    bursts = Bursts(np.asarray(starts) / 1e9, np.asarray(ends) / 1e9, np.asarray(events))
+    return Report(np.arange(self.nbins) * res / 1e9, rate, duty, freqs, power, peak_hz, bursts)
+
+
+def analyze(path, block_edges=1 << 20, **options):
+  """Analyze a recording file in blocks of block_edges edges"""
+  log = EdgeLog(path)
+  analyzer = Analyzer(log.duration_ns(), **options)
+  for times, levels in log.blocks(block_edges):
+    analyzer.feed(times, levels)
+  log.close()
+  return analyzer.finish()
+
+
+def main():
+  if len(sys.argv) != 2:
+    print("Usage: analytics.py RECORDING.vib")
+    sys.exit(1)
+  report = analyze(sys.argv[1])
+  hours = report.start_s[-1] / 3600
+  print(f"\n=== Vibration Analysis: {sys.argv[1]} ({hours:.2f} h) ===\n")
+  for window in WINDOWS:
+    rate = report.rate[window]
+    duty = report.duty[window]
+    print(f"{window:>3} s window: rate mean {rate.mean():7.2f}/s max {rate.max():7.2f}/s, "
+          f"duty mean {duty.mean():5.1f}% max {duty.max():5.1f}%")
+  if report.peak_hz:
+    print(f"\nStrongest periodicity: {report.peak_hz:.2f} Hz")
+  bursts = report.bursts
+  print(f"Bursts: {len(bursts.events)}")
+  if len(bursts.events):
+    lengths = bursts.end_s - bursts.start_s
+    print(f"  events per burst mean {bursts.events.mean():.1f}, "
+          f"length mean {lengths.mean():.2f} s max {lengths.max():.2f} s")
+
+
+if __name__ == "__main__":
+  main()
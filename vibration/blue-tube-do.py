@@ -2,13 +2,29 @@
 # filepath: /home/user/my-iot-scripts/vibration_sensor_test.py
 
 import RPi.GPIO as GPIO
+import os
+import sys
 import time
 from datetime import datetime
 
+import numpy as np
+
+from edge_ring import EdgeRing, EventCounter
+from history import WindowedHistory
+from edge_log import EdgeRecorder, EdgeLog
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from event_store import EventStore
+
 # Configuration
 VIBRATION_PIN = 17  # GPIO pin connected to DO pin
 SENSITIVITY = 0.01  # Seconds between readings
 RECORD_TIME = 3.0   # Seconds to record vibrations
+DEBOUNCE_MS = 50    # Quiet time that separates two vibrations
+MONITOR_HZ = 1000   # Samples per second in the real-time monitor
+MONITOR_WINDOWS = (1, 10, 60)  # Seconds of history shown at once
+DISPLAY_HZ = 10     # Monitor redraws per second
+BAR_WIDTH = 20
 
 def setup():
   """Initialize GPIO settings"""
@@ -45,38 +61,71 @@ def basic_detection():
   finally:
     GPIO.cleanup()
 
+def edge_detection():
+  """Interrupt-driven detection, every edge captured with a ns timestamp"""
+  ring = EdgeRing(VIBRATION_PIN)
+  counter = EventCounter(debounce_ms=DEBOUNCE_MS)
+  try:
+    setup()
+    print("\n=== SW-420 Edge Capture ===")
+    print("Every pulse is recorded, bursts are counted as one vibration")
+    print("Press Ctrl+C to exit\n")
+
+    ring.start()
+    while True:
+      # The callback fills the ring, we only drain it a few times a second
+      time.sleep(0.1)
+      events = counter.feed(ring.read()) + counter.flush()
+      # counter.events already counts the whole batch
+      for number, event in enumerate(events, counter.events - len(events) + 1):
+        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        widths = ", ".join(f"{w / 1000:.1f}" for w in event.widths_us[:8])
+        more = " ..." if len(event.widths_us) > 8 else ""
+        print(f"[{timestamp}] Vibration #{number}: {event.pulses} pulses "
+              f"in {event.duration_ms:.1f} ms, low {event.low_ns / 1e6:.1f} ms "
+              f"(widths ms: {widths}{more})")
+
+  except KeyboardInterrupt:
+    print(f"\n\nTotal vibrations: {counter.events}, pulses: {counter.pulses}")
+    if ring.overruns:
+      print(f"Edges lost to ring overruns: {ring.overruns}")
+  finally:
+    GPIO.cleanup()
+
 def real_time_monitor():
   """Visual real-time vibration monitor"""
   try:
     setup()
     print("\n=== Real-time Vibration Monitor ===")
-    print("Visualizes vibration intensity")
+    print(f"Samples at {MONITOR_HZ} Hz, intensity over " +
+          "/".join(f"{w}s" for w in MONITOR_WINDOWS))
     print("Press Ctrl+C to exit\n")
     
-    window_size = 20
-    vibration_history = [0] * window_size
+    history = WindowedHistory(MONITOR_HZ, MONITOR_WINDOWS)
+    interval = 1.0 / MONITOR_HZ
+    redraw = MONITOR_HZ // DISPLAY_HZ
+    next_sample = time.monotonic()
     
     while True:
-      # Shift history left
-      vibration_history = vibration_history[1:] + [0]
-      
-      # Check for vibration (LOW = vibration)
-      if GPIO.input(VIBRATION_PIN) == 0:
-        vibration_history[-1] = 1
-      
-      # Create visual bar
-      bar = ""
-      for v in vibration_history:
-        bar += "█" if v else "░"
+      # Check for vibration (LOW = vibration), O(1) per sample
+      history.push(GPIO.input(VIBRATION_PIN) == 0)
       
-      # Calculate "intensity" based on recent vibrations
-      intensity = sum(vibration_history) / window_size * 100
+      # Redraw a few times a second, not on every sample
+      if history.count % redraw == 0:
+        bars = []
+        for window in MONITOR_WINDOWS:
+          intensity = history.intensity(window)
+          filled = round(intensity / 100 * BAR_WIDTH)
+          bars.append(f"{window:>2}s {'█' * filled}{'░' * (BAR_WIDTH - filled)} {intensity:3.0f}%")
+        print("\r" + "  ".join(bars), end="", flush=True)
       
-      # Print real-time bar
-      print(f"\r{bar} {intensity:3.0f}%", end="", flush=True)
-      
-      # Small delay between readings
-      time.sleep(SENSITIVITY)
+      # Next sample on the absolute grid, skip samples we are past
+      next_sample += interval
+      delay = next_sample - time.monotonic()
+      if delay > 0:
+        time.sleep(delay)
+      elif delay < -interval:
+        next_sample = time.monotonic()
       
   except KeyboardInterrupt:
     print("\n\nMonitoring stopped")
@@ -112,15 +161,17 @@ def sensitivity_test():
     GPIO.cleanup()
 
 def vibration_recorder():
-  """Record vibration pattern"""
+  """Record vibration pattern to a binary edge log"""
   try:
     setup()
     print("\n=== Vibration Pattern Recorder ===")
-    print(f"Records vibrations for {RECORD_TIME} seconds")
+    print(f"Streams every edge to disk, {RECORD_TIME} s by default, 0 = until Ctrl+C")
     print("Press Ctrl+C to exit\n")
     
     while True:
-      input("Press Enter to start recording...")
+      answer = input(f"Seconds to record [{RECORD_TIME}]: ").strip()
+      duration = float(answer) if answer else RECORD_TIME
+      path = datetime.now().strftime("vibration-%Y%m%d-%H%M%S.vib")
       
       print("3...")
       time.sleep(1)
@@ -130,50 +181,44 @@ def vibration_recorder():
       time.sleep(1)
       print("GO! (tap pattern now)")
       
-      # Record start time
-      start_time = time.time()
-      
-      # Recording variables
-      recording = []
-      last_state = 1  # Start with no vibration
-      
-      # Record for set time
-      while time.time() - start_time < RECORD_TIME:
-        current_state = GPIO.input(VIBRATION_PIN)
-        
-        # If state changed
-        if current_state != last_state:
-          # Record time and new state
-          event_time = time.time() - start_time
-          recording.append((event_time, current_state))
-          last_state = current_state
-          
-          # Visual feedback
-          print("!" if current_state == 0 else ".", 
+      # Edges go straight to the file, memory stays bounded
+      recorder = EdgeRecorder(VIBRATION_PIN, path).start()
+      start_time = time.monotonic()
+      try:
+        while duration == 0 or time.monotonic() - start_time < duration:
+          time.sleep(min(1.0, duration or 1.0))
+          print(f"\r{time.monotonic() - start_time:8.0f} s  {recorder.edges} edges",
                 end="", flush=True)
-        
-        time.sleep(SENSITIVITY)
+      except KeyboardInterrupt:
+        pass
+      recorder.stop()
+      elapsed = time.monotonic() - start_time
       
       # Show recording results
+      log = EdgeLog(path)
+      times = log.times() / 1e9
+      levels = log.levels()
       print("\n\nRecording complete!")
-      print(f"Captured {len(recording)} state changes")
+      print(f"Captured {len(times)} state changes in {path} "
+            f"({os.path.getsize(path)} bytes)")
       
       # Display pattern
       print("\nPattern timeline:")
-      print("0.0" + "-" * 50 + f"{RECORD_TIME:.1f}s")
+      print("0.0" + "-" * 50 + f"{elapsed:.1f}s")
       
       # Create timeline visualization
-      timeline = [" "] * 50
-      for time_point, state in recording:
-        position = int((time_point / RECORD_TIME) * 49)
-        timeline[position] = "V" if state == 0 else "^"
-      
+      timeline = np.full(50, " ")
+      positions = np.minimum((times / elapsed * 49).astype(int), 49)
+      timeline[positions] = np.where(levels == 0, "V", "^")
       print("".join(timeline))
       
       print("\nData points:")
-      for i, (event_time, state) in enumerate(recording):
+      for i, (event_time, state) in enumerate(zip(times[:20], levels[:20])):
         event_type = "Vibration" if state == 0 else "Stopped"
         print(f"{i+1}. {event_type} at {event_time:.3f}s")
+      if len(times) > 20:
+        print(f"... {len(times) - 20} more")
+      log.close()
       
       print("\n" + "-" * 40)
       
@@ -184,16 +229,17 @@ def vibration_recorder():
 
 def security_monitor():
   """Simple security monitor"""
+  store = EventStore()
   try:
     setup()
     print("\n=== Security Monitor ===")
     print("Detects vibrations/movement")
+    print(f"Events are kept in {store.path}")
     print("Press Ctrl+C to exit\n")
     
     # Get current time as start time
     start_time = time.time()
     last_detection = start_time
-    events = []
     
     print("Monitoring started...")
     
@@ -203,9 +249,9 @@ def security_monitor():
         
         # If it's been more than 3 seconds since last detection
         if current_time - last_detection > 3:
-          # Record this event
-          timestamp = datetime.now()
-          events.append(timestamp)
+          # Record this event (queued, the store writes in the background)
+          store.record("sw420", "movement", when=current_time)
+          timestamp = datetime.fromtimestamp(current_time)
           
           # Show alert
           elapsed = current_time - start_time
@@ -225,15 +271,22 @@ def security_monitor():
       time.sleep(0.1)
       
   except KeyboardInterrupt:
+    store.flush()
+    events = store.query(start=start_time, sensor="sw420")
     print("\n\nMonitoring stopped")
     print(f"Total events: {len(events)}")
     
     if events:
       print("\nEvent log:")
-      for i, event in enumerate(events):
-        print(f"{i+1}. {event.strftime('%H:%M:%S')}")
+      for i, (ts, _, _, _) in enumerate(events[-20:], max(len(events) - 20, 0)):
+        print(f"{i+1}. {datetime.fromtimestamp(ts).strftime('%H:%M:%S')}")
+      
+      print("\nEvents per minute:")
+      for minute, _, count in store.counts("minute", start=start_time, sensor="sw420"):
+        print(f"{datetime.fromtimestamp(minute).strftime('%H:%M')}  {'█' * count} {count}")
   
   finally:
+    store.close()
     GPIO.cleanup()
 
 if __name__ == "__main__":
@@ -243,8 +296,9 @@ if __name__ == "__main__":
   print("3. Sensitivity adjustment")
   print("4. Vibration pattern recorder")
   print("5. Security monitor")
+  print("6. Edge capture detection")
   
-  choice = input("\nSelect mode (1-5): ")
+  choice = input("\nSelect mode (1-6): ")
   
   if choice == "2":
     real_time_monitor()
@@ -254,5 +308,7 @@ if __name__ == "__main__":
     vibration_recorder()
   elif choice == "5":
     security_monitor()
+  elif choice == "6":
+    edge_detection()
   else:
     basic_detection()
\ No newline at end of file
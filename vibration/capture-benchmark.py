@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+SW-420 capture benchmark - 10 ms polling vs. edge ring
+Plays scripted vibration bursts on a simulated pin (gpio_sim) and compares
+how many vibrations and pulses each approach counted, pulse width error
+and CPU use. The polling side is the basic_detection loop.
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import gpio_sim
+gpio_sim.install()
+
+import RPi.GPIO as GPIO
+from edge_ring import EdgeRing, EventCounter
+
+PIN = 17
+BURSTS = 20
+
+
+def script():
+  """Bursts of 1-6 short LOW pulses separated by 0.2-0.6 s of quiet"""
+  rng = random.Random(420)
+  pulses = []
+  widths = []
+  for _ in range(BURSTS):
+    count = rng.randint(1, 6)
+    for i in range(count):
+      low = rng.randint(300, 4000)
+      widths.append(low)
+      pulses += [low, rng.randint(2000, 8000) if i + 1 < count else rng.randint(200000, 600000)]
+  # The player toggles after every width, end on the last rising edge
+  return pulses[:-1], widths
+
+
+def poll(duration):
+  """basic_detection: sample every 10 ms, back off 100 ms after a hit"""
+  count = 0
+  end = time.monotonic() + duration
+  while time.monotonic() < end:
+    if GPIO.input(PIN) == 0:
+      count += 1
+      time.sleep(0.1)
+    time.sleep(0.01)
+  return count
+
+
+def main():
+  GPIO.setmode(GPIO.BCM)
+  GPIO.setup(PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+  pulses, widths = script()
+  duration = sum(pulses) / 1e6 + 0.5
+
+  print("\n=== SW-420 Capture Benchmark ===")
+  print(f"{BURSTS} bursts, {len(widths)} pulses, {duration:.1f} s\n")
+
+  gpio_sim.player_cpu = 0.0
+  gpio_sim.play(PIN, pulses, start_level=GPIO.LOW, delay=0.1)
+  cpu = time.process_time()
+  hits = poll(duration)
+  cpu = time.process_time() - cpu - gpio_sim.player_cpu
+  print(f"polling:   {hits:3} vibrations, pulses not measured, CPU {cpu / duration * 100:.1f}%")
+
+  ring = EdgeRing(PIN)
+  counter = EventCounter()
+  gpio_sim.player_cpu = 0.0
+  ring.start()
+  gpio_sim.play(PIN, pulses, start_level=GPIO.LOW, delay=0.1)
+  cpu = time.process_time()
+  events = []
+  end = time.monotonic() + duration
+  while time.monotonic() < end:
+    time.sleep(0.1)
+    events += counter.feed(ring.read())
+  events += counter.flush(time.perf_counter_ns() + counter.debounce_ns + 1)
+  cpu = time.process_time() - cpu - gpio_sim.player_cpu
+  measured = [w for event in events for w in event.widths_us]
+  errors = [abs(m - w) for m, w in zip(measured, widths)]
+  print(f"edge ring: {counter.events:3} vibrations, {counter.pulses} pulses, "
+        f"width error mean {sum(errors) / len(errors):.0f} us, CPU {cpu / duration * 100:.1f}%")
+  ring.stop()
+  GPIO.cleanup()
+
+
+if __name__ == "__main__":
+  main()
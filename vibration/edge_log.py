@@ -0,0 +1,193 @@
+"""
+Streaming binary edge recorder and memory-mapped reader
+EdgeRecorder drains an EdgeRing in a background thread and appends
+delta-encoded edge times to a file in chunks of at most CHUNK_EDGES
+edges, so memory stays bounded however long it runs. The file is fsynced
+every FSYNC_INTERVAL seconds; a crash loses at most that much.
+
+File layout (little endian):
+  header  "VIB1", started (wall clock ns), pin
+  chunk   base_ns (ns since start of the first edge), count, first level,
+          count - 1 uint32 deltas to the previous edge
+
+Levels alternate inside a chunk. A gap too long for a uint32 delta (4.3 s)
+starts a new chunk.
+
+  recorder = EdgeRecorder(PIN, "pump.vib").start()
+  ...
+  recorder.stop()
+  log = EdgeLog("pump.vib")
+  log.times(), log.levels()      # NumPy arrays
+"""
+
+import os
+import mmap
+import time
+import struct
+import threading
+from array import array
+
+import numpy as np
+
+MAGIC = b"VIB1"
+HEADER = struct.Struct("<4sqB3x")
+CHUNK = struct.Struct("<qIB3x")
+CHUNK_EDGES = 4096
+MAX_DELTA = 0xFFFFFFFF
+DRAIN_INTERVAL = 0.1     # seconds between ring drains
+FSYNC_INTERVAL = 5.0     # seconds between fsyncs
+
+
+class EdgeRecorder:
+  def __init__(self, pin, path):
+    # Imported here so recordings can be read on a machine without RPi.GPIO
+    from edge_ring import EdgeRing
+    self.pin = pin
+    self.path = path
+    self.ring = EdgeRing(pin)
+    self.edges = 0
+    self.chunks = 0
+    self._file = None
+    self._thread = None
+    self._stop = threading.Event()
+    self._deltas = array("I")
+    self._base = None         # ns since start of the chunk's first edge
+    self._first_level = 0
+    self._level = None        # level after the last edge
+    self._last = None
+
+  def start(self):
+    """Create the file and start recording in the background"""
+    self._file = open(self.path, "wb")
+    self._file.write(HEADER.pack(MAGIC, time.time_ns(), self.pin))
+    self._start_ns = time.perf_counter_ns()
+    self.ring.start()
+    self._thread = threading.Thread(target=self._run, daemon=True)
+    self._thread.start()
+    return self
+
+  def stop(self):
+    """Stop recording, write what is pending and close the file"""
+    self._stop.set()
+    self._thread.join()
+    self.ring.stop()
+    self._drain()
+    self._write_chunk()
+    self._sync()
+    self._file.close()
+
+  def _run(self):
+    next_sync = time.monotonic() + FSYNC_INTERVAL
+    while not self._stop.wait(DRAIN_INTERVAL):
+      self._drain()
+      if time.monotonic() >= next_sync:
+        # Partial chunk too, so the fsync covers everything seen so far
+        self._write_chunk()
+        self._sync()
+        next_sync += FSYNC_INTERVAL
+
+  def _drain(self):
+    for when, level in self.ring.read():
+      when -= self._start_ns
+      # Every edge is a change; the level read in the callback can be
+      # stale for very short pulses, so only the first one is trusted
+      level = level if self._level is None else self._level ^ 1
+      self._level = level
+      if self._base is None:
+        self._base = when
+        self._first_level = level
+      else:
+        delta = when - self._last
+        if delta > MAX_DELTA or len(self._deltas) + 1 >= CHUNK_EDGES:
+          self._write_chunk()
+          self._base = when
+          self._first_level = level
+        else:
+          self._deltas.append(delta)
+      self._last = when
+      self.edges += 1
+
+  def _write_chunk(self):
+    if self._base is None:
+      return
+    self._file.write(CHUNK.pack(self._base, len(self._deltas) + 1, self._first_level))
+    self._file.write(self._deltas.tobytes())
+    self.chunks += 1
+    self._deltas = array("I")
+    self._base = None
+
+  def _sync(self):
+    self._file.flush()
+    os.fsync(self._file.fileno())
+
+
+class EdgeLog:
+  """Read-only view of a recording, decoded to NumPy arrays"""
+
+  def __init__(self, path):
+    self._file = open(path, "rb")
+    self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, self.started_ns, self.pin = HEADER.unpack_from(self._map, 0)
+    if magic != MAGIC:
+      raise ValueError(f"{path} is not a vibration recording")
+    self.chunks = []          # (base_ns, count, first_level, offset of deltas)
+    offset = HEADER.size
+    while offset + CHUNK.size <= len(self._map):
+      base, count, level = CHUNK.unpack_from(self._map, offset)
+      offset += CHUNK.size
+      end = offset + 4 * (count - 1)
+      if end > len(self._map):
+        break                 # chunk cut short by a crash
+      self.chunks.append((base, count, level, offset))
+      offset = end
+
+  def __len__(self):
+    return sum(count for _, count, _, _ in self.chunks)
+
+  def _decode(self, chunks):
+    times = []
+    levels = []
+    for base, count, level, offset in chunks:
+      deltas = np.frombuffer(self._map, dtype="<u4", count=count - 1, offset=offset)
+      chunk = np.empty(count, dtype=np.int64)
+      chunk[0] = base
+      np.cumsum(deltas, dtype=np.int64, out=chunk[1:])
+      chunk[1:] += base
+      times.append(chunk)
+      levels.append(((np.arange(count) + level) % 2).astype(np.int8))
+    if not times:
+      return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8)
+    return np.concatenate(times), np.concatenate(levels)
+
+  def times(self):
+    """Edge times in ns since the start of the recording (int64)"""
+    return self._decode(self.chunks)[0]
+
+  def levels(self):
+    """Level after each edge (int8)"""
+    return self._decode(self.chunks)[1]
+
+  def blocks(self, edges=1 << 20):
+    """(times, levels) arrays of about edges edges each, for bounded memory"""
+    start = 0
+    total = 0
+    for i, (_, count, _, _) in enumerate(self.chunks):
+      total += count
+      if total >= edges:
+        yield self._decode(self.chunks[start:i + 1])
+        start = i + 1
+        total = 0
+    if start < len(self.chunks):
+      yield self._decode(self.chunks[start:])
+
+  def duration_ns(self):
+    """Time of the last edge"""
+    if not self.chunks:
+      return 0
+    base, count, _, offset = self.chunks[-1]
+    deltas = np.frombuffer(self._map, dtype="<u4", count=count - 1, offset=offset)
+    return base + int(deltas.sum(dtype=np.int64))
+
+  def close(self):
+    self._map.close()
+    self._file.close()
@@ -0,0 +1,122 @@
+"""
+Interrupt-driven edge capture for digital vibration sensors
+EdgeRing records every rising and falling edge of a pin with a
+perf_counter_ns timestamp into a preallocated ring buffer. The GPIO
+callback is the only writer and only moves the head index, the reader
+only moves its own tail, so neither side takes a lock. Debouncing and
+counting happen on the consumer side in EventCounter.
+
+  ring = EdgeRing(VIBRATION_PIN)
+  counter = EventCounter(debounce_ms=50)
+  ring.start()
+  for event in counter.feed(ring.read()):
+    print(event.pulses, event.duration_ms)
+"""
+
+import time
+from array import array
+from collections import namedtuple
+
+import RPi.GPIO as GPIO
+
+RING_SIZE = 4096     # edges, power of two
+DEBOUNCE_MS = 50     # quiet time that ends a vibration event
+
+
+class Vibration(namedtuple("Vibration", "start_ns end_ns pulses low_ns widths_us")):
+  """One debounced vibration: first falling edge to last rising edge"""
+  __slots__ = ()
+
+  @property
+  def duration_ms(self):
+    return (self.end_ns - self.start_ns) / 1e6
+
+
+class EdgeRing:
+  def __init__(self, pin, size=RING_SIZE):
+    if size & (size - 1):
+      raise ValueError("Ring size must be a power of two")
+    self.pin = pin
+    self.mask = size - 1
+    self.stamps = array("q", bytes(8 * size))
+    self.levels = array("b", bytes(size))
+    self.head = 0        # edges written, only the callback moves it
+    self.tail = 0        # edges read, only read() moves it
+    self.overruns = 0    # edges lost because the reader fell behind
+
+  def _on_edge(self, channel):
+    now = time.perf_counter_ns()
+    i = self.head & self.mask
+    self.stamps[i] = now
+    self.levels[i] = GPIO.input(channel)
+    self.head += 1       # publish after the slot is filled
+
+  def start(self):
+    """Start recording edges"""
+    GPIO.add_event_detect(self.pin, GPIO.BOTH, callback=self._on_edge)
+
+  def stop(self):
+    GPIO.remove_event_detect(self.pin)
+
+  def read(self):
+    """(timestamp_ns, level) of every edge since the last read"""
+    head = self.head
+    tail = self.tail
+    if head - tail > self.mask + 1:
+      self.overruns += head - tail - self.mask - 1
+      tail = head - self.mask - 1
+    edges = [(self.stamps[i & self.mask], self.levels[i & self.mask])
+             for i in range(tail, head)]
+    self.tail = head
+    return edges
+
+
+class EventCounter:
+  """Debounces raw edges into vibration events and counts them"""
+
+  def __init__(self, debounce_ms=DEBOUNCE_MS):
+    self.debounce_ns = int(debounce_ms * 1e6)
+    self.events = 0
+    self.pulses = 0          # raw LOW pulses
+    self._level = 1          # SW-420 DO idles HIGH
+    self._fell = None        # time of the pending falling edge
+    self._current = None     # [start, last_rise, pulses, low_ns, widths]
+
+  def feed(self, edges):
+    """Consume edges, returns the vibrations that finished"""
+    finished = []
+    for when, level in edges:
+      if self._current and when - self._current[1] > self.debounce_ns and self._fell is None:
+        finished.append(self._close())
+      if level == self._level:
+        # Pulse shorter than the callback latency: the level read back
+        # already flipped again, but every edge is a change
+        level ^= 1
+      self._level = level
+      if level == 0:
+        self._fell = when
+        if self._current is None:
+          self._current = [when, when, 0, 0, []]
+      elif self._fell is not None:
+        width = when - self._fell
+        current = self._current
+        current[1] = when
+        current[2] += 1
+        current[3] += width
+        current[4].append(width // 1000)
+        self.pulses += 1
+        self._fell = None
+    return finished
+
+  def flush(self, now_ns=None):
+    """Close the current vibration if it has been quiet for the debounce time"""
+    now_ns = time.perf_counter_ns() if now_ns is None else now_ns
+    if self._current and self._fell is None and now_ns - self._current[1] > self.debounce_ns:
+      return [self._close()]
+    return []
+
+  def _close(self):
+    start, end, pulses, low_ns, widths = self._current
+    self._current = None
+    self.events += 1
+    return Vibration(start, end, pulses, low_ns, widths)
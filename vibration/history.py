@@ -0,0 +1,50 @@
+"""
+Fixed-size sample history with running sums
+One preallocated ring holds the longest window; every shorter window keeps
+its own running sum, updated from the sample entering and the one leaving
+it. A push is O(number of windows) no matter how long the windows are.
+
+  history = WindowedHistory(rate_hz=1000, windows=(1, 10, 60))
+  history.push(GPIO.input(PIN) == 0)
+  history.intensity(10)     # % of the last 10 s that was vibrating
+"""
+
+from array import array
+
+
+class WindowedHistory:
+  def __init__(self, rate_hz, windows=(1, 10, 60)):
+    self.rate_hz = rate_hz
+    self.windows = tuple(sorted(windows))
+    self.lengths = [max(1, round(w * rate_hz)) for w in self.windows]
+    self.size = self.lengths[-1]
+    self.ring = array("b", bytes(self.size))
+    self.sums = [0] * len(self.windows)
+    self.count = 0       # samples pushed so far
+
+  def push(self, value):
+    """Add a 0/1 sample"""
+    value = 1 if value else 0
+    ring = self.ring
+    size = self.size
+    i = self.count % size
+    for k, length in enumerate(self.lengths):
+      # Sample falling out of this window (the ring is zeroed to start with)
+      self.sums[k] += value - ring[(i - length) % size]
+    ring[i] = value
+    self.count += 1
+
+  def intensity(self, window):
+    """Share of hits in a window as a percentage"""
+    k = self.windows.index(window)
+    filled = min(self.count, self.lengths[k])
+    return self.sums[k] / filled * 100 if filled else 0.0
+
+  def recent(self, n):
+    """Last n samples, oldest first"""
+    n = min(n, self.count, self.size)
+    end = self.count % self.size
+    start = end - n
+    if start >= 0:
+      return self.ring[start:end]
+    return self.ring[start:] + self.ring[:end]
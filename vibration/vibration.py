@@ -1,10 +1,29 @@
 #!/usr/bin/env python3
 
 import RPi.GPIO as GPIO
+import json
+import os
+import sys
 import time
+import queue
 from datetime import datetime
 
+from rhythm import RhythmLibrary, TEMPLATES, MIN_CONFIDENCE
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from event_store import EventStore
+from alarms import make_dispatcher
+from debounce import Debouncer
+
 KNOCK_SENSOR_PIN = 17
+ALARM_BUZZER_PIN = 27
+ALARM_LED_PIN = 22
+ALARM_LOG = "alarms.log"
+ALARM_WEBHOOK = "http://localhost:8080/alarm"   # None to disable
+ALARM_HOLDOFF = 0.5   # seconds before the same vibration can alarm again
+TEMPLATES_FILE = "knock_templates.json"   # recorded rhythms, name -> intervals
+KNOCK_LOCKOUT_MS = 150   # bounces ignored after a knock
+KNOCK_GAP = 1.0          # seconds without a knock that end a pattern
 
 def setup():
   """Initialize GPIO settings"""
@@ -14,10 +33,19 @@ def setup():
              pull_up_down=GPIO.PUD_UP)
   print("Knock sensor initialized")
 
+def knock_input():
+  """Debouncer reporting every knock as a press, from its first edge"""
+  knocks = Debouncer()
+  knocks.add(KNOCK_SENSOR_PIN, leading=True, debounce_ms=KNOCK_LOCKOUT_MS,
+             long_ms=None, double_ms=0)
+  return knocks
+
 def basic_detection():
   """Basic knock detection"""
+  knock_events = None
   try:
     setup()
+    knock_events = knock_input()
     print("\n=== Knock Sensor Test ===")
     print("Tap the sensor or surface nearby")
     print("Press Ctrl+C to exit\n")
@@ -26,80 +54,111 @@ def basic_detection():
     
     while True:
       # Sensor outputs LOW when knocked
-      if GPIO.input(KNOCK_SENSOR_PIN) == 0:
+      if knock_events.events.get().kind == "press":
         knock_count += 1
         timestamp = datetime.now().strftime("%H:%M:%S")
         print(f"[{timestamp}] Knock detected! #{knock_count}")
-        
-        # Wait to avoid multiple detections
-        time.sleep(0.2)
-      
-      # Small delay to reduce CPU usage
-      time.sleep(0.01)
       
   except KeyboardInterrupt:
     print(f"\n\nTotal knocks: {knock_count}")
   finally:
+    if knock_events:
+      knock_events.close()
     GPIO.cleanup()
 
+def load_templates():
+  """Built-in rhythms plus the recorded ones"""
+  templates = dict(TEMPLATES)
+  if os.path.exists(TEMPLATES_FILE):
+    with open(TEMPLATES_FILE) as f:
+      templates.update(json.load(f))
+  return templates
+
+def collect_knocks(knock_events):
+  """Knock timestamps (seconds) until KNOCK_GAP passes without a knock"""
+  knocks = []
+  while True:
+    # Wait for the first knock as long as it takes, then up to the gap
+    timeout = None if not knocks else max(0, knocks[-1] + KNOCK_GAP - time.perf_counter())
+    try:
+      gesture = knock_events.events.get(timeout=timeout)
+    except queue.Empty:
+      return knocks
+    if gesture.kind == "press":
+      knocks.append(gesture.when_ns / 1e9)
+      print("*", end="", flush=True)
+
 def pattern_detector():
   """Detect knock patterns"""
+  knock_events = None
   try:
     setup()
+    knock_events = knock_input()
+    library = RhythmLibrary(load_templates())
     print("\n=== Knock Pattern Detector ===")
-    print("Try knocking patterns like:")
-    print("- 2 knocks = Double tap")
-    print("- 3 knocks = Triple tap")
+    print(f"Matching against {len(library)} rhythms, try:")
+    print("- Knock-knock...knock vs. Knock...knock-knock")
+    print("- Shave and a haircut")
     print("Press Ctrl+C to exit\n")
     
-    knocks = []
-    last_knock_time = 0
-    
     while True:
-      if GPIO.input(KNOCK_SENSOR_PIN) == 0:
-        current_time = time.time()
-        
-        # If more than 1 second since last knock
-        # analyze previous pattern
-        if current_time - last_knock_time > 1.0:
-          if len(knocks) > 0:
-            analyze_pattern(knocks)
-          knocks = []
-        
-        knocks.append(current_time)
-        last_knock_time = current_time
-        print("*", end="", flush=True)
-        
-        # Debounce
-        time.sleep(0.15)
-      
-      # Check for pattern timeout
-      if knocks and time.time() - last_knock_time > 1.0:
-        analyze_pattern(knocks)
-        knocks = []
-      
-      time.sleep(0.01)
+      analyze_pattern(collect_knocks(knock_events), library)
       
   except KeyboardInterrupt:
     print("\n\nPattern detection stopped")
   finally:
+    if knock_events:
+      knock_events.close()
     GPIO.cleanup()
 
-def analyze_pattern(knocks):
+def analyze_pattern(knocks, library):
   """Analyze knock pattern"""
   count = len(knocks)
   print(f"\nPattern: {count} knocks")
   
-  if count == 1:
+  start = time.perf_counter()
+  match = library.match(knocks)
+  elapsed = (time.perf_counter() - start) * 1000
+  
+  if match is None:
     print("→ Single tap")
-  elif count == 2:
-    print("→ Double tap")
-  elif count == 3:
-    print("→ Triple tap")
-  elif count == 4:
-    print("→ Quadruple tap")
+  elif match.confidence >= MIN_CONFIDENCE:
+    print(f"→ {match.name} ({match.confidence:.0%} sure, {elapsed:.1f} ms)")
   else:
-    print(f"→ Complex pattern ({count} taps)")
+    print(f"→ Unknown rhythm, closest is {match.name} ({match.confidence:.0%})")
+
+def record_template():
+  """Record a knock rhythm as a new template"""
+  knock_events = None
+  try:
+    setup()
+    knock_events = knock_input()
+    print("\n=== Record Knock Rhythm ===")
+    print("Knock the rhythm, then wait a second")
+    print("Press Ctrl+C to exit\n")
+    
+    knocks = collect_knocks(knock_events)
+    if len(knocks) < 2:
+      print("\nNeed at least two knocks")
+      return
+    
+    name = input(f"\n{len(knocks)} knocks recorded, name: ").strip()
+    if name:
+      templates = {}
+      if os.path.exists(TEMPLATES_FILE):
+        with open(TEMPLATES_FILE) as f:
+          templates = json.load(f)
+      templates[name] = [round(b - a, 3) for a, b in zip(knocks, knocks[1:])]
+      with open(TEMPLATES_FILE, "w") as f:
+        json.dump(templates, f, indent=2)
+      print(f"Saved '{name}' to {TEMPLATES_FILE}")
+      
+  except KeyboardInterrupt:
+    print("\n\nRecording cancelled")
+  finally:
+    if knock_events:
+      knock_events.close()
+    GPIO.cleanup()
 
 def sensitivity_monitor():
   """Monitor sensitivity continuously"""
@@ -127,36 +186,40 @@ def sensitivity_monitor():
 
 def vibration_alarm():
   """Vibration alarm mode"""
+  store = EventStore()
+  alarms = None
   try:
     setup()
+    alarms = make_dispatcher(ALARM_BUZZER_PIN, ALARM_LED_PIN, ALARM_LOG, ALARM_WEBHOOK)
     print("\n=== Vibration Alarm ===")
     print("Detects any vibration/movement")
     print("Place on door, window, or object")
     print("Press Ctrl+C to exit\n")
     
     print("Alarm ARMED - Monitoring...")
-    triggered = False
+    last_alarm = 0
+    previous = 1
     
     while True:
-      if GPIO.input(KNOCK_SENSOR_PIN) == 0:
-        if not triggered:
-          print("\n⚠️  ALARM! Vibration detected! ⚠️")
-          print("Time:", datetime.now())
-          triggered = True
-          
-          # Alarm for 3 seconds
-          for i in range(30):
-            print("!", end="", flush=True)
-            time.sleep(0.1)
-          
-          print("\n\nRe-armed...")
-          triggered = False
+      state = GPIO.input(KNOCK_SENSOR_PIN)
+      now = time.monotonic()
+      # New vibration: only queue the alarm, keep sampling
+      if state == 0 and previous == 1 and now - last_alarm > ALARM_HOLDOFF:
+        alarms.raise_alarm("knock", "Vibration detected")
+        store.record("knock", "alarm")
+        last_alarm = now
+        print(f"\n⚠️  ALARM #{alarms.raised}! Vibration detected! ⚠️  {datetime.now()}")
+      previous = state
       
       time.sleep(0.01)
       
   except KeyboardInterrupt:
     print("\n\nAlarm disarmed")
   finally:
+    if alarms:
+      alarms.close()
+      print(alarms.report())
+    store.close()
     GPIO.cleanup()
 
 if __name__ == "__main__":
@@ -165,8 +228,9 @@ if __name__ == "__main__":
   print("2. Pattern detection")
   print("3. Sensitivity monitor")
   print("4. Vibration alarm")
+  print("5. Record knock rhythm")
   
-  choice = input("\nSelect mode (1-4): ")
+  choice = input("\nSelect mode (1-5): ")
   
   if choice == "2":
     pattern_detector()
@@ -174,5 +238,7 @@ if __name__ == "__main__":
     sensitivity_monitor()
   elif choice == "4":
     vibration_alarm()
+  elif choice == "5":
+    record_template()
   else:
     basic_detection()
\ No newline at end of file